@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Columnar - Compressed column-chunked result files with a random-access reader
+"""
+
+import json
+import struct
+import zlib
+from typing import List, Dict, Optional, Any, Iterable, Iterator, Tuple
+
+MAGIC = b'AWSCOL1\n'
+# Trailer: footer offset, footer length, magic
+TRAILER = struct.Struct('<QQ8s')
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+class ColumnarWriter:
+    """Write results incrementally as zlib-compressed column chunks
+
+    Every `chunk_size` records, each field is written as its own
+    compressed JSON array. A footer records chunk/column offsets and a
+    URL index, so readers can load only the columns they need and jump
+    straight to a single URL.
+    """
+
+    def __init__(self, path: str, chunk_size: int = DEFAULT_CHUNK_SIZE, level: int = 6):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.level = level
+        self._file = open(path, 'wb')
+        self._file.write(MAGIC)
+        self._pending: List[Dict[str, Any]] = []
+        self._chunks: List[Dict[str, Any]] = []
+        self._columns: Dict[str, None] = {}
+        self._urls: Dict[str, Tuple[int, int]] = {}
+
+    def write(self, result: Dict[str, Any]) -> None:
+        if hasattr(result, 'to_dict'):
+            result = result.to_dict()
+        self._pending.append(result)
+        if len(self._pending) >= self.chunk_size:
+            self._flush_chunk()
+
+    def write_all(self, results: Iterable[Dict[str, Any]]) -> None:
+        for result in results:
+            self.write(result)
+
+    def _flush_chunk(self) -> None:
+        if not self._pending:
+            return
+
+        chunk_index = len(self._chunks)
+        names: Dict[str, None] = {}
+        for row, result in enumerate(self._pending):
+            names.update(dict.fromkeys(result))
+            url = result.get('url')
+            if url is not None:
+                self._urls.setdefault(url, (chunk_index, row))
+        self._columns.update(names)
+
+        columns = {}
+        for name in names:
+            values = [result.get(name) for result in self._pending]
+            data = zlib.compress(
+                json.dumps(values, ensure_ascii=False).encode('utf-8'),
+                self.level
+            )
+            columns[name] = (self._file.tell(), len(data))
+            self._file.write(data)
+
+        self._chunks.append({"rows": len(self._pending), "columns": columns})
+        self._pending = []
+
+    def close(self) -> None:
+        self._flush_chunk()
+        footer = zlib.compress(json.dumps({
+            "columns": list(self._columns),
+            "chunks": self._chunks,
+            "urls": self._urls
+        }, ensure_ascii=False).encode('utf-8'))
+        offset = self._file.tell()
+        self._file.write(footer)
+        self._file.write(TRAILER.pack(offset, len(footer), MAGIC))
+        self._file.close()
+
+    def abort(self) -> None:
+        """Close without a footer, so readers reject the partial file"""
+        self._file.close()
+
+    def __enter__(self) -> 'ColumnarWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class ColumnarReader:
+    """Read a columnar results file with column projection and URL lookup"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        if self._file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"Not a columnar results file: {path}")
+
+        if self._file.seek(0, 2) < len(MAGIC) + TRAILER.size:
+            raise ValueError(f"Truncated columnar results file: {path}")
+        self._file.seek(-TRAILER.size, 2)
+        offset, length, magic = TRAILER.unpack(self._file.read(TRAILER.size))
+        if magic != MAGIC:
+            raise ValueError(f"Truncated columnar results file: {path}")
+
+        self._file.seek(offset)
+        footer = json.loads(zlib.decompress(self._file.read(length)))
+        self.columns: List[str] = footer['columns']
+        self.chunks: List[Dict[str, Any]] = footer['chunks']
+        self.urls: Dict[str, List[int]] = footer['urls']
+        self._cache: Dict[Tuple[int, str], List[Any]] = {}
+
+    def __len__(self) -> int:
+        return sum(chunk['rows'] for chunk in self.chunks)
+
+    def _column(self, chunk_index: int, name: str) -> List[Any]:
+        """Decompress one column of one chunk (last chunk's columns are cached)"""
+
+        key = (chunk_index, name)
+        if key not in self._cache:
+            chunk = self.chunks[chunk_index]
+            if name not in chunk['columns']:
+                return [None] * chunk['rows']
+            offset, length = chunk['columns'][name]
+            self._file.seek(offset)
+            if self._cache and next(iter(self._cache))[0] != chunk_index:
+                self._cache.clear()
+            self._cache[key] = json.loads(zlib.decompress(self._file.read(length)))
+        return self._cache[key]
+
+    def _row(self, chunk_index: int, row: int, names: List[str]) -> Dict[str, Any]:
+        record = {}
+        for name in names:
+            value = self._column(chunk_index, name)[row]
+            if value is not None:
+                record[name] = value
+        return record
+
+    def iter_records(self, columns: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        """Yield records, decompressing only the requested columns"""
+
+        names = columns or self.columns
+        for chunk_index, chunk in enumerate(self.chunks):
+            for row in range(chunk['rows']):
+                yield self._row(chunk_index, row, names)
+
+    def get(self, url: str, columns: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """Random access to one record by URL"""
+
+        location = self.urls.get(url)
+        if location is None:
+            return None
+        chunk_index, row = location
+        return self._row(chunk_index, row, columns or self.columns)
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> 'ColumnarReader':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def read_results(path: str, columns: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """Load all records from a columnar file, optionally only some columns"""
+    with ColumnarReader(path) as reader:
+        return list(reader.iter_records(columns))
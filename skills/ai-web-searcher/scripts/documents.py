@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Documents - Content-type sniffing and process-pool PDF text extraction
+"""
+
+import functools
+import importlib.util
+import multiprocessing
+import os
+import shutil
+import subprocess
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Any, Tuple
+
+# Bytes read before deciding how (or whether) to download the rest
+SNIFF_BYTES = 1024
+
+# Largest document body downloaded for text extraction
+MAX_DOCUMENT_BYTES = 50 * 1024 * 1024
+
+# Pages of text extracted per PDF
+MAX_PDF_PAGES = 50
+
+HTML = 'html'
+PDF = 'pdf'
+UNSUPPORTED = 'unsupported'
+
+# Leading bytes of common binary formats
+MAGIC_BYTES = (
+    (b'%PDF-', PDF),
+    (b'\x89PNG', UNSUPPORTED),
+    (b'\xff\xd8\xff', UNSUPPORTED),  # JPEG
+    (b'GIF8', UNSUPPORTED),
+    (b'PK\x03\x04', UNSUPPORTED),    # zip, docx, xlsx
+    (b'\x1f\x8b', UNSUPPORTED),      # gzip
+    (b'RIFF', UNSUPPORTED),          # webp, wav, avi
+    (b'ID3', UNSUPPORTED),           # mp3
+    (b'OggS', UNSUPPORTED),
+)
+
+TEXT_TYPES = ('text/', 'application/xhtml', 'application/xml', 'application/json')
+# Structured text subtypes, e.g. application/rss+xml, application/ld+json
+TEXT_SUFFIXES = ('+xml', '+json')
+# Leading bytes of XML documents (feeds, sitemaps) served under any type
+XML_MAGIC = (b'<?xml', b'<rss', b'<feed', b'<urlset', b'<sitemapindex')
+
+
+NO_PDF_EXTRACTOR = "No PDF text extractor available (install pypdf or poppler-utils)"
+
+
+class UnsupportedContent(Exception):
+    """Raised for responses that are not worth downloading or parsing"""
+
+
+def sniff_content_type(content_type: str, head: bytes) -> str:
+    """Classify a response as HTML, PDF or unsupported
+
+    Magic bytes win over the Content-Type header, since servers often
+    send binaries as application/octet-stream or even text/html.
+    """
+
+    for magic, kind in MAGIC_BYTES:
+        if head.startswith(magic):
+            return kind
+    if head[4:8] == b'ftyp':  # mp4, mov
+        return UNSUPPORTED
+    if head.lstrip(b'\xef\xbb\xbf \t\r\n').startswith(XML_MAGIC):
+        return HTML
+
+    content_type = content_type.split(';')[0].strip().lower()
+    if content_type == 'application/pdf':
+        return PDF
+    if (not content_type or content_type.startswith(TEXT_TYPES)
+            or content_type.endswith(TEXT_SUFFIXES)):
+        return HTML
+    if b'\x00' in head:
+        return UNSUPPORTED
+    # Unknown type but text-looking bytes: let the HTML parser try
+    return HTML if content_type == 'application/octet-stream' else UNSUPPORTED
+
+
+def extract_pdf_text(
+    path: str,
+    text_path: str,
+    max_pages: int = MAX_PDF_PAGES
+) -> Dict[str, Any]:
+    """Extract text from a PDF file into `text_path`, page by page
+
+    Runs inside the PDF process pool. Pages are written out as they are
+    parsed, so the document text is never built up in the worker or
+    sent back through the pool's pipe. Uses pypdf when installed and
+    falls back to the pdftotext command line tool.
+    """
+
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        PdfReader = None
+
+    if PdfReader is not None:
+        reader = PdfReader(path)
+        with open(text_path, 'w', encoding='utf-8') as out:
+            written = False
+            for page in reader.pages[:max_pages]:
+                text = (page.extract_text() or '').strip()
+                if text:
+                    out.write(('\n\n' if written else '') + text)
+                    written = True
+        metadata = reader.metadata or {}
+        return {
+            "title": (metadata.get('/Title') or '').strip(),
+            "pages": len(reader.pages)
+        }
+
+    if shutil.which('pdftotext'):
+        result = subprocess.run(
+            ['pdftotext', '-l', str(max_pages), '-layout', '-enc', 'UTF-8', path, text_path],
+            capture_output=True,
+            timeout=120
+        )
+        if result.returncode != 0:
+            raise Exception(f"pdftotext failed: {result.stderr.decode('utf-8', 'replace')}")
+        return {"title": "", "pages": None}
+
+    raise UnsupportedContent(NO_PDF_EXTRACTOR)
+
+
+@functools.lru_cache(maxsize=None)
+def pdf_extractor_available() -> bool:
+    """Whether pypdf or pdftotext is installed (checked once per process)"""
+    return (importlib.util.find_spec('pypdf') is not None
+            or shutil.which('pdftotext') is not None)
+
+
+def read_pdf_text(text_path: str) -> Tuple[str, int]:
+    """Read text written by extract_pdf_text; returns (content, page count)
+
+    pdftotext separates pages with form feeds, which become paragraph
+    breaks like pypdf's output.
+    """
+
+    with open(text_path, 'r', encoding='utf-8', errors='replace') as f:
+        text = f.read()
+    pages = [page.strip() for page in text.split('\f') if page.strip()]
+    return '\n\n'.join(pages), len(pages)
+
+
+_pdf_pool: Optional[ProcessPoolExecutor] = None
+_pdf_pool_lock = threading.Lock()
+
+
+def get_pdf_pool() -> ProcessPoolExecutor:
+    """Shared process pool for PDF parsing, created on first use"""
+
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is None:
+            # spawn: forking a process that is running fetch threads is unsafe
+            _pdf_pool = ProcessPoolExecutor(
+                max_workers=max(1, (os.cpu_count() or 2) // 2),
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return _pdf_pool
@@ -10,6 +10,12 @@ import os
 import sys
 import time
 import random
+import re
+import shutil
+import socket
+import tempfile
+import urllib.error
+import urllib.request
 from datetime import datetime
 from typing import List, Dict, Optional, Any
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -19,11 +25,42 @@ workspace = os.path.expanduser('~/.openclaw/workspace')
 if workspace not in sys.path:
     sys.path.insert(0, workspace)
 
+# Persistent state shared across runs (feeds, fetch history, host health)
+STATE_DIR = os.path.expanduser('~/.openclaw/ai-web-searcher')
+DEFAULT_FETCH_STATE = os.path.join(STATE_DIR, 'fetch_state.json')
+DEFAULT_HOST_HEALTH = os.path.join(STATE_DIR, 'host_health.json')
+
 try:
     import subprocess
 except ImportError:
     pass
 
+from columnar import ColumnarWriter
+from documents import (
+    HTML, PDF, MAX_DOCUMENT_BYTES, NO_PDF_EXTRACTOR, SNIFF_BYTES, UnsupportedContent,
+    extract_pdf_text, get_pdf_pool, pdf_extractor_available, read_pdf_text,
+    sniff_content_type
+)
+from feeds import FetchState, discover_urls
+from host_health import HostHealth
+from result_store import ResultStore, as_dict
+from service_client import call_service, default_server
+from work_queue import WorkQueue
+
+# Compiled once so long-running processes (see service.py) keep them warm
+TITLE_RE = re.compile(r'<title[^>]*>(.*?)</title>', re.IGNORECASE | re.DOTALL)
+SCRIPT_RE = re.compile(r'<script[^>]*>.*?</script>', re.IGNORECASE | re.DOTALL)
+STYLE_RE = re.compile(r'<style[^>]*>.*?</style>', re.IGNORECASE | re.DOTALL)
+PARAGRAPH_RE = re.compile(r'<p[^>]*>(.*?)</p>', re.IGNORECASE | re.DOTALL)
+TAG_RE = re.compile(r'<[^>]+>')
+
+# Seconds allowed per fetch, and per PDF parse when no deadline is tighter
+REQUEST_TIMEOUT = 30
+PDF_PARSE_TIMEOUT = 120
+
+# 4xx statuses that are worth retrying (the rest mean this page is unavailable)
+RETRYABLE_CLIENT_ERRORS = (408, 429)
+
 
 class WebExtractor:
     """Extract content from web pages with AI analysis"""
@@ -38,7 +75,8 @@ class WebExtractor:
         summary_length: int = 200,
         selectors: Optional[Dict] = None,
         auth: Optional[str] = None,
-        cookies: Optional[str] = None
+        cookies: Optional[str] = None,
+        health: Optional[HostHealth] = None
     ):
         self.mode = mode
         self.concurrency = concurrency
@@ -49,6 +87,7 @@ class WebExtractor:
         self.selectors = selectors or {}
         self.auth = auth
         self.cookies = cookies
+        self.health = health
 
     def parse_delay(self) -> tuple:
         """Parse delay string (e.g., "2", "1-3")"""
@@ -69,39 +108,107 @@ class WebExtractor:
         url: str,
         url_config: Optional[Dict] = None
     ) -> Dict[str, Any]:
-        """Extract content from a single URL with retry logic"""
+        """Extract content from a single URL with retry logic
+
+        `url_config` may carry a `deadline` (Unix timestamp): attempts
+        are then cut short and not retried once it passes.
+        """
 
         url_config = url_config or {}
         mode = url_config.get('mode', self.mode)
+        deadline = url_config.get('deadline')
+
+        # Fail fast while the host's circuit breaker is open
+        if self.health is not None and not self.health.allow(url):
+            print(f"⛔ Skipping {url}: host circuit open")
+            return {
+                "url": url,
+                "status": "failed",
+                "error": "Host circuit open (recent failures)",
+                "attempts": 0
+            }
 
         for attempt in range(self.retries):
+            started = time.monotonic()
             try:
                 # Add delay if configured
                 if self.delay != "0" and attempt > 0:
                     delay_time = self.get_delay()
                     time.sleep(delay_time)
+                    started = time.monotonic()
+
+                timeout = REQUEST_TIMEOUT
+                if deadline is not None:
+                    timeout = min(timeout, deadline - time.time())
+                    if timeout <= 0:
+                        return {
+                            "url": url,
+                            "status": "failed",
+                            "error": "Deadline exceeded",
+                            "attempts": attempt
+                        }
 
                 # Choose extraction method based on mode
                 if mode == "light":
-                    result = await self.extract_light(url)
+                    result = await self.extract_light(url, timeout)
                 elif mode == "browser":
-                    result = await self.extract_browser(url)
+                    result = await self.extract_browser(url, timeout)
                 elif mode == "deep":
-                    result = await self.extract_deep(url)
+                    result = await self.extract_deep(url, timeout)
                 else:
                     raise ValueError(f"Unknown mode: {mode}")
 
                 result['extraction_mode'] = mode
                 result['attempt'] = attempt + 1
 
+                if self.health is not None:
+                    self.health.record_success(url, time.monotonic() - started)
+
                 # Add AI summary if requested
                 if self.summarize:
                     result['summary'] = await self.generate_summary(result)
 
                 return result
 
+            except UnsupportedContent as e:
+                # The host answered fine; there is just nothing to extract
+                if self.health is not None:
+                    self.health.record_success(url, time.monotonic() - started)
+                print(f"⏭️  Skipping {url}: {str(e)}")
+                return {
+                    "url": url,
+                    "status": "skipped",
+                    "error": str(e),
+                    "extraction_mode": mode,
+                    "attempts": attempt + 1
+                }
+
             except Exception as e:
+                if (isinstance(e, urllib.error.HTTPError) and 400 <= e.code < 500
+                        and e.code not in RETRYABLE_CLIENT_ERRORS):
+                    # A dead or forbidden page says nothing about the host's
+                    # health and will not recover on retry
+                    print(f"Attempt {attempt + 1}/{self.retries} failed for {url}: "
+                          f"{str(e)} (not retried)")
+                    return {
+                        "url": url,
+                        "status": "failed",
+                        "error": str(e),
+                        "http_status": e.code,
+                        "attempts": attempt + 1
+                    }
+
                 print(f"Attempt {attempt + 1}/{self.retries} failed for {url}: {str(e)}")
+                if self.health is not None:
+                    self.health.record_failure(url, time.monotonic() - started)
+                    # Stop retrying once the host's circuit has opened
+                    if self.health.is_open(url):
+                        return {
+                            "url": url,
+                            "status": "failed",
+                            "error": str(e),
+                            "attempts": attempt + 1
+                        }
                 if attempt == self.retries - 1:
                     return {
                         "url": url,
@@ -110,17 +217,29 @@ class WebExtractor:
                         "attempts": attempt + 1
                     }
 
-    async def extract_light(self, url: str) -> Dict[str, Any]:
-        """Light extraction using web_fetch (static HTML)"""
+    async def extract_light(self, url: str, timeout: float = REQUEST_TIMEOUT) -> Dict[str, Any]:
+        """Light extraction using web_fetch (static HTML, PDF documents)"""
+
+        request = urllib.request.Request(url, headers={
+            'User-Agent': 'Mozilla/5.0 (compatible; ai-web-searcher)'
+        })
 
-        # Use OpenClaw's web_fetch via CLI
-        cmd = ['curl', '-s', '-L', url]
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            # Decide from headers and the first bytes before downloading the body
+            content_type = response.headers.get('Content-Type', '')
+            head = response.read(SNIFF_BYTES)
+            kind = sniff_content_type(content_type, head)
 
-        if result.returncode != 0:
-            raise Exception(f"Failed to fetch URL: {result.stderr}")
+            if kind == PDF:
+                # Without a text extractor, skip before downloading the body
+                if not pdf_extractor_available():
+                    raise UnsupportedContent(NO_PDF_EXTRACTOR)
+                return await self.extract_pdf(url, response, head, timeout)
+            if kind != HTML:
+                raise UnsupportedContent(f"Unsupported content type: {content_type or 'unknown'}")
 
-        html_content = result.stdout
+            charset = response.headers.get_content_charset() or 'utf-8'
+            html_content = (head + response.read()).decode(charset, errors='replace')
 
         # Basic content extraction (can be enhanced)
         title = self._extract_title(html_content)
@@ -131,39 +250,99 @@ class WebExtractor:
             "title": title,
             "content": content,
             "status": "success",
+            "content_type": content_type,
+            "extraction_time": datetime.utcnow().isoformat() + "Z",
+            "word_count": len(content.split())
+        }
+
+    async def extract_pdf(
+        self,
+        url: str,
+        response: Any,
+        head: bytes,
+        timeout: float = REQUEST_TIMEOUT
+    ) -> Dict[str, Any]:
+        """Stream a PDF to disk and extract its text in the PDF process pool"""
+
+        # The worker writes the text next to the PDF; both go on any exit
+        workdir = tempfile.mkdtemp(prefix='ai-web-searcher-')
+        try:
+            path = os.path.join(workdir, 'document.pdf')
+            text_path = os.path.join(workdir, 'document.txt')
+
+            with open(path, 'wb') as f:
+                f.write(head)
+                size = len(head)
+                while True:
+                    chunk = response.read(64 * 1024)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > MAX_DOCUMENT_BYTES:
+                        raise UnsupportedContent(f"PDF larger than {MAX_DOCUMENT_BYTES} bytes")
+                    f.write(chunk)
+
+            # http.client ends a cut-off body quietly instead of raising
+            expected = response.headers.get('Content-Length')
+            if expected and expected.isdigit() and size < int(expected):
+                raise ConnectionError(f"PDF download truncated at {size} of {expected} bytes")
+
+            # CPU-heavy parsing runs in another process, off this thread's loop
+            loop = asyncio.get_running_loop()
+            document = await asyncio.wait_for(
+                loop.run_in_executor(get_pdf_pool(), extract_pdf_text, path, text_path),
+                PDF_PARSE_TIMEOUT if timeout >= REQUEST_TIMEOUT else timeout
+            )
+            content, pages = read_pdf_text(text_path)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        return {
+            "url": url,
+            "title": document['title'] or os.path.basename(url.split('?')[0]) or "Untitled",
+            "content": content,
+            "status": "success",
+            "content_type": "application/pdf",
+            "pages": document['pages'] or pages,
             "extraction_time": datetime.utcnow().isoformat() + "Z",
             "word_count": len(content.split())
         }
 
-    async def extract_browser(self, url: str) -> Dict[str, Any]:
+    async def extract_browser(self, url: str, timeout: float = REQUEST_TIMEOUT) -> Dict[str, Any]:
         """Browser-based extraction (full rendering)"""
 
+        started = time.monotonic()
         # Use OpenClaw's browser tool
         try:
             # Try using browser tool via exec
-            cmd = ['openclaw', 'browser', 'open', '--url', url, '--timeout', '30']
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+            cmd = ['openclaw', 'browser', 'open', '--url', url, '--timeout', str(int(timeout) or 1)]
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout * 2)
 
             # For now, fallback to fetch + basic parsing
             # In production, this would use the browser API properly
-            return await self.extract_light(url)
+            return await self.extract_light(url, timeout)
+
+        except UnsupportedContent:
+            raise
 
         except Exception as e:
             print(f"Browser extraction failed, falling back to light mode: {e}")
-            return await self.extract_light(url)
+            remaining = timeout - (time.monotonic() - started)
+            if remaining <= 0:
+                raise
+            return await self.extract_light(url, remaining)
 
-    async def extract_deep(self, url: str) -> Dict[str, Any]:
+    async def extract_deep(self, url: str, timeout: float = REQUEST_TIMEOUT) -> Dict[str, Any]:
         """Deep extraction using Crawlee (for complex sites)"""
 
         # Placeholder for deep scraper integration
         # Would integrate with deep-scraper skill
         print(f"Deep extraction not fully implemented, using browser mode for {url}")
-        return await self.extract_browser(url)
+        return await self.extract_browser(url, timeout)
 
     def _extract_title(self, html: str) -> str:
         """Extract title from HTML"""
-        import re
-        title_match = re.search(r'<title[^>]*>(.*?)</title>', html, re.IGNORECASE | re.DOTALL)
+        title_match = TITLE_RE.search(html)
         if title_match:
             return title_match.group(1).strip()
         return "Untitled"
@@ -172,18 +351,17 @@ class WebExtractor:
         """Extract main content from HTML"""
 
         # Remove script and style tags
-        import re
-        html = re.sub(r'<script[^>]*>.*?</script>', '', html, flags=re.IGNORECASE | re.DOTALL)
-        html = re.sub(r'<style[^>]*>.*?</style>', '', html, flags=re.IGNORECASE | re.DOTALL)
+        html = SCRIPT_RE.sub('', html)
+        html = STYLE_RE.sub('', html)
 
         # Extract paragraphs
-        paragraphs = re.findall(r'<p[^>]*>(.*?)</p>', html, re.IGNORECASE | re.DOTALL)
+        paragraphs = PARAGRAPH_RE.findall(html)
 
         # Clean HTML tags
         content = []
         for p in paragraphs:
             # Remove HTML tags
-            clean_p = re.sub(r'<[^>]+>', '', p)
+            clean_p = TAG_RE.sub('', p)
             clean_p = clean_p.strip()
             if len(clean_p) > 50:  # Filter very short paragraphs
                 content.append(clean_p)
@@ -208,11 +386,16 @@ async def extract_urls(
     urls: List[str],
     extractor: WebExtractor,
     continue_on_error: bool = False,
-    log_file: Optional[str] = None
+    log_file: Optional[str] = None,
+    store: Optional[ResultStore] = None
 ) -> List[Dict[str, Any]]:
-    """Extract content from multiple URLs concurrently"""
+    """Extract content from multiple URLs concurrently
+
+    With a ResultStore, results are kept as compact records (content
+    spilled to its segment file) and the store itself is returned.
+    """
 
-    results = []
+    results = store if store is not None else []
     errors = []
 
     # Use ThreadPoolExecutor for concurrent processing
@@ -233,16 +416,22 @@ async def extract_urls(
             )
             future_to_url[future] = url
 
-        # Collect results as they complete
+        # Collect results as they complete, dropping each finished future
+        # so its result (content included) can be freed once stored
         for future in as_completed(future_to_url):
-            url = future_to_url[future]
+            url = future_to_url.pop(future)
             try:
                 result = future.result()
-                results.append(result)
+                if store is not None:
+                    result = store.append(result)
+                else:
+                    results.append(result)
 
                 if result.get('status') == 'failed':
                     errors.append(result)
                     print(f"❌ Failed: {url} - {result.get('error', 'Unknown error')}")
+                elif result.get('status') == 'skipped':
+                    print(f"⏭️  Skipped: {url} - {result.get('error', 'Unsupported content')}")
                 else:
                     print(f"✅ Success: {url} ({result.get('word_count', 0)} words)")
 
@@ -261,14 +450,112 @@ async def extract_urls(
                     break
 
     # Log errors if requested
-    if log_file and errors:
-        with open(log_file, 'w') as f:
-            json.dump(errors, f, indent=2)
-        print(f"\nLogged {len(errors)} errors to {log_file}")
+    if log_file:
+        write_error_log(log_file, errors)
 
     return results
 
 
+def write_error_log(log_file: str, errors: List[Dict[str, Any]]) -> None:
+    """Write failed results to the --log file"""
+
+    if not errors:
+        return
+    with open(log_file, 'w') as f:
+        json.dump([as_dict(error) for error in errors], f, indent=2)
+    print(f"\nLogged {len(errors)} errors to {log_file}")
+
+
+def run_worker(
+    queue_path: str,
+    extractor: WebExtractor,
+    worker_id: Optional[str] = None,
+    batch_size: int = 20,
+    lease_seconds: float = 300,
+    poll_interval: float = 5.0
+) -> int:
+    """Process URLs from a shared work queue until it is drained"""
+
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+
+    def work(slot: int) -> int:
+        name = f"{worker_id}-{slot}"
+        queue = WorkQueue(queue_path)
+        processed = 0
+        try:
+            while True:
+                lease = queue.lease(name, batch_size, lease_seconds)
+                if lease is None:
+                    counts = queue.counts()
+                    if counts['pending'] == 0 and counts['leased'] == 0:
+                        break
+                    # Remaining domains are leased by other workers; wait
+                    # for them to finish or for their leases to expire
+                    time.sleep(poll_interval)
+                    continue
+
+                domain, batch = lease
+                try:
+                    for url_id, config in batch:
+                        # Pace the host from its last fetch by any worker, so
+                        # the delay also holds across batches and leases
+                        if extractor.delay != "0":
+                            last_fetch = queue.last_fetch(domain)
+                            if last_fetch is not None:
+                                wait = extractor.get_delay() - (time.time() - last_fetch)
+                                if wait > 0:
+                                    time.sleep(wait)
+
+                        url = config['url']
+                        result = asyncio.run(extractor.extract_single_url(url, config))
+                        queue.complete(url_id, result)
+                        processed += 1
+
+                        if result.get('status') == 'failed':
+                            print(f"❌ Failed: {url} - {result.get('error', 'Unknown error')}")
+                        elif result.get('status') == 'skipped':
+                            print(f"⏭️  Skipped: {url} - {result.get('error', 'Unsupported content')}")
+                        else:
+                            print(f"✅ Success: {url} ({result.get('word_count', 0)} words)")
+
+                        if not queue.renew(domain, name, lease_seconds):
+                            print(f"⚠️  Lost lease on {domain}, leaving rest of batch")
+                            break
+                finally:
+                    queue.release(domain, name)
+        finally:
+            queue.close()
+        return processed
+
+    with ThreadPoolExecutor(max_workers=extractor.concurrency) as executor:
+        return sum(executor.map(work, range(extractor.concurrency)))
+
+
+def discover(
+    url_configs: List[Dict[str, Any]],
+    state: FetchState,
+    limit: int = 500
+) -> tuple:
+    """Expand input URLs through feeds/sitemaps (see feeds.py)
+
+    Returns (url_configs still to fetch, results taken from feed content).
+    """
+
+    to_fetch = []
+    ready = []
+    for url_config in url_configs:
+        url = url_config['url']
+        try:
+            pages, results = discover_urls(url_config, state, limit)
+        except Exception as e:
+            print(f"⚠️  Discovery failed for {url}, fetching it directly: {str(e)}")
+            pages, results = [url_config], []
+        print(f"🧭 {url}: {len(pages)} pages to fetch, {len(results)} from feed content")
+        to_fetch.extend(pages)
+        ready.extend(results)
+    return to_fetch, ready
+
+
 def load_urls(input_path: str) -> List[Dict[str, Any]]:
     """Load URLs from file (txt or json)"""
 
@@ -303,7 +590,15 @@ def save_results(
 
     if format == 'json':
         with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+            if isinstance(results, ResultStore):
+                # Same layout as json.dump(indent=2), one record at a time
+                f.write('[' if len(results) else '[]')
+                for i, result in enumerate(results):
+                    item = json.dumps(result.to_dict(), indent=2, ensure_ascii=False)
+                    f.write((',\n  ' if i else '\n  ') + item.replace('\n', '\n  '))
+                f.write('\n]' if len(results) else '')
+            else:
+                json.dump(results, f, indent=2, ensure_ascii=False)
 
     elif format == 'markdown':
         with open(output_path, 'w', encoding='utf-8') as f:
@@ -315,6 +610,13 @@ def save_results(
                     f.write("---\n\n")
                     continue
 
+                if result.get('status') == 'skipped':
+                    f.write(f"# ⏭️ Skipped\n\n")
+                    f.write(f"**URL**: {result['url']}\n")
+                    f.write(f"**Reason**: {result.get('error', 'Unsupported content')}\n\n")
+                    f.write("---\n\n")
+                    continue
+
                 f.write(f"# {result.get('title', 'Untitled')}\n\n")
                 f.write(f"**URL**: {result['url']}\n")
                 f.write(f"**Extracted**: {result.get('extraction_time', 'N/A')}\n")
@@ -323,7 +625,14 @@ def save_results(
                 if 'summary' in result:
                     f.write(f"\n## Summary\n\n{result['summary']}\n\n")
 
-                f.write(f"## Content\n\n{result.get('content', '')}\n\n")
+                if hasattr(result, 'content_view'):
+                    # Copy the body straight from the segment file
+                    f.write("## Content\n\n")
+                    f.flush()
+                    f.buffer.write(result.content_view())
+                    f.write("\n\n")
+                else:
+                    f.write(f"## Content\n\n{result.get('content', '')}\n\n")
                 f.write("---\n\n")
 
     elif format == 'csv':
@@ -345,6 +654,11 @@ def save_results(
                     'status': result.get('status', 'failed')
                 })
 
+    elif format == 'columnar':
+        # Compressed column chunks with a URL index (see columnar.py)
+        with ColumnarWriter(output_path) as writer:
+            writer.write_all(results)
+
     else:
         raise ValueError(f"Unsupported format: {format}")
 
@@ -383,7 +697,7 @@ def main():
     parser.add_argument('--cookies', help='Cookie file')
 
     # Output options
-    parser.add_argument('--format', choices=['json', 'markdown', 'csv'], default='json',
+    parser.add_argument('--format', choices=['json', 'markdown', 'csv', 'columnar'], default='json',
                        help='Output format (default: json)')
     parser.add_argument('--output', default='results.json',
                        help='Output file (default: results.json)')
@@ -393,8 +707,49 @@ def main():
                        help='Continue on errors instead of stopping')
     parser.add_argument('--log', help='Log file for errors')
 
+    # Memory
+    parser.add_argument('--compact', action='store_true',
+                       help='Keep results as compact records with content spilled to disk (large batches)')
+    parser.add_argument('--spill-file',
+                       help='Content segment file for --compact (default: temporary file)')
+
+    # Feed and sitemap discovery
+    parser.add_argument('--discover', action='store_true',
+                       help='Expand URLs through their RSS/Atom feeds or sitemaps, skipping unchanged pages')
+    parser.add_argument('--discover-limit', type=int, default=500,
+                       help='Maximum pages discovered per input URL (default: 500)')
+    parser.add_argument('--fetch-state', default=DEFAULT_FETCH_STATE,
+                       help=f'Last-fetch times used by --discover (default: {DEFAULT_FETCH_STATE})')
+
+    # Host health
+    parser.add_argument('--host-health', default=DEFAULT_HOST_HEALTH,
+                       help=f'Per-host health and circuit breaker state (default: {DEFAULT_HOST_HEALTH})')
+    parser.add_argument('--no-host-health', action='store_true',
+                       help='Disable host health tracking and circuit breaking')
+
+    # Search service
+    parser.add_argument('--server', default=default_server(),
+                       help='Search service URL (see service.py); falls back to one-shot')
+
+    # Distributed extraction
+    parser.add_argument('--queue',
+                       help='Shared work queue database (SQLite); --url/--urls are enqueued')
+    parser.add_argument('--worker', action='store_true',
+                       help='Process URLs from --queue until it is drained')
+    parser.add_argument('--merge', action='store_true',
+                       help='Write all finished results in --queue to --output')
+    parser.add_argument('--worker-id', help='Worker name (default: hostname-pid)')
+    parser.add_argument('--batch-size', type=int, default=20,
+                       help='URLs leased per domain at a time (default: 20)')
+    parser.add_argument('--lease-timeout', type=float, default=300,
+                       help='Seconds before an unrenewed lease is reassigned (default: 300)')
+
     args = parser.parse_args()
 
+    if args.server and args.host_health != DEFAULT_HOST_HEALTH:
+        parser.error("--host-health cannot be used with --server "
+                     "(the service keeps its own; use --no-host-health to disable it)")
+
     # Load URLs
     url_configs = []
 
@@ -402,7 +757,7 @@ def main():
         url_configs = load_urls(args.urls)
     elif args.url:
         url_configs = [{"url": url} for url in args.url]
-    else:
+    elif not args.queue:
         parser.error("Must provide --urls or --url")
 
     # Load custom selectors if provided
@@ -421,34 +776,161 @@ def main():
         summary_length=args.summary_length,
         selectors=selectors,
         auth=args.auth,
-        cookies=args.cookies
+        cookies=args.cookies,
+        health=None if args.no_host_health else HostHealth(args.host_health)
     )
 
+    fetch_state = None
+    feed_results = []
+    if args.discover:
+        fetch_state = FetchState(args.fetch_state)
+        url_configs, feed_results = discover(url_configs, fetch_state, args.discover_limit)
+
+    if args.queue:
+        if fetch_state is not None:
+            # Keep sitemap marks from discovery; pages are marked at --merge
+            fetch_state.save()
+        run_queue(args, url_configs, extractor, feed_results)
+        return
+
     # Extract content
     print(f"🚀 Starting extraction of {len(url_configs)} URLs...")
     print(f"   Mode: {args.mode}")
     print(f"   Concurrency: {args.concurrency}")
     print(f"   Delay: {args.delay}s\n")
 
-    results = asyncio.run(extract_urls(
-        urls=url_configs,
-        extractor=extractor,
-        continue_on_error=args.continue_on_error,
-        log_file=args.log
-    ))
-
-    # Save results
-    save_results(results, args.output, args.format)
-
-    # Print summary
-    successful = sum(1 for r in results if r.get('status') == 'success')
-    failed = len(results) - successful
-
-    print(f"\n✨ Extraction complete!")
-    print(f"   Total: {len(results)}")
-    print(f"   Successful: {successful}")
-    print(f"   Failed: {failed}")
-    print(f"   Output: {args.output}")
+    results = None
+    if args.server:
+        try:
+            response = call_service(args.server, '/extract', {
+                'urls': url_configs,
+                'mode': args.mode,
+                'concurrency': args.concurrency,
+                'delay': args.delay,
+                'retries': args.retries,
+                'summarize': args.summarize,
+                'summary_length': args.summary_length,
+                'selectors': selectors,
+                'continue_on_error': args.continue_on_error,
+                'host_health': not args.no_host_health
+            })
+        except RuntimeError as e:
+            print(f"❌ Error: {str(e)}")
+            sys.exit(1)
+        if response is not None:
+            results = response['results']
+            if args.log:
+                write_error_log(
+                    args.log, [r for r in results if r.get('status') == 'failed']
+                )
+
+    store = ResultStore(args.spill_file) if args.compact else None
+
+    try:
+        if results is not None and store is not None:
+            store.extend(results)
+            results = store
+        elif results is None:
+            results = asyncio.run(extract_urls(
+                urls=url_configs,
+                extractor=extractor,
+                continue_on_error=args.continue_on_error,
+                log_file=args.log,
+                store=store
+            ))
+
+        if fetch_state is not None:
+            results.extend(feed_results)
+            for result in results:
+                if result.get('status') == 'success':
+                    fetch_state.mark(result['url'])
+            fetch_state.save()
+
+        if extractor.health is not None:
+            extractor.health.save()
+
+        # Save results
+        save_results(results, args.output, args.format)
+
+        # Print summary
+        successful = sum(1 for r in results if r.get('status') == 'success')
+        skipped = sum(1 for r in results if r.get('status') == 'skipped')
+        failed = len(results) - successful - skipped
+
+        print(f"\n✨ Extraction complete!")
+        print(f"   Total: {len(results)}")
+        print(f"   Successful: {successful}")
+        print(f"   Skipped: {skipped}")
+        print(f"   Failed: {failed}")
+        print(f"   Output: {args.output}")
+    finally:
+        if store is not None:
+            store.close()
+
+
+def run_queue(
+    args: argparse.Namespace,
+    url_configs: List[Dict[str, Any]],
+    extractor: WebExtractor,
+    feed_results: Optional[List[Dict[str, Any]]] = None
+) -> None:
+    """Coordinator/worker/merge steps for distributed extraction"""
+
+    queue = WorkQueue(args.queue)
+    try:
+        if url_configs:
+            # Discovered URLs are new or changed, so done ones are redone
+            added = queue.enqueue(url_configs, requeue=args.discover)
+            print(f"📥 Queued {added} new{' or changed' if args.discover else ''} URLs in {args.queue}")
+
+        if feed_results:
+            added = queue.add_results(feed_results)
+            print(f"📥 Stored {added} results from feed content in {args.queue}")
+
+        if args.worker:
+            print(f"🚀 Worker started on {args.queue}")
+            print(f"   Mode: {args.mode}")
+            print(f"   Concurrency: {args.concurrency}")
+            print(f"   Delay: {args.delay}s\n")
+            processed = run_worker(
+                args.queue,
+                extractor,
+                worker_id=args.worker_id,
+                batch_size=args.batch_size,
+                lease_seconds=args.lease_timeout
+            )
+            if extractor.health is not None:
+                extractor.health.save()
+            print(f"\n✨ Worker processed {processed} URLs")
+
+        if args.merge:
+            # Record fetch times so later --discover runs skip these pages
+            fetch_state = FetchState(args.fetch_state)
+            merged = 0
+            for result in queue.iter_results():
+                if result.get('status') == 'success':
+                    fetch_state.mark(result['url'])
+                merged += 1
+            fetch_state.save()
+
+            if args.format == 'columnar':
+                # Columnar output is written chunk by chunk straight from the queue
+                save_results(queue.iter_results(), args.output, args.format)
+            else:
+                results = ResultStore(args.spill_file) if args.compact else []
+                try:
+                    results.extend(queue.iter_results())
+                    save_results(results, args.output, args.format)
+                finally:
+                    if args.compact:
+                        results.close()
+            print(f"\n📦 Merged {merged} results into {args.output}")
+
+        counts = queue.counts()
+        print(f"\n📊 Queue: {counts['pending']} pending, "
+              f"{counts['leased']} leased, {counts['done']} done")
+    finally:
+        queue.close()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Feeds - RSS/Atom and sitemap discovery with lastmod-based skipping
+"""
+
+import gzip
+import html
+import json
+import os
+import re
+import time
+import urllib.request
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import List, Dict, Optional, Any, Iterator, IO, Tuple
+from urllib.parse import urljoin, urlsplit
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (compatible; ai-web-searcher)'
+
+# Feed entries with at least this many words are used without fetching the page
+MIN_FEED_WORDS = 150
+
+FEED_LINK_RE = re.compile(r'<link\b[^>]*>', re.IGNORECASE)
+ATTR_RE = re.compile(r'([a-zA-Z:-]+)\s*=\s*["\']([^"\']*)["\']')
+FEED_TYPES = ('application/rss+xml', 'application/atom+xml')
+XML_MARKERS = (b'<?xml', b'<rss', b'<feed', b'<urlset', b'<sitemapindex')
+TAG_RE = re.compile(r'<[^>]+>')
+
+# Full-content elements: RSS content module and Atom (1.0 and 0.3)
+CONTENT_TAGS = (
+    '{http://purl.org/rss/1.0/modules/content/}encoded',
+    '{http://www.w3.org/2005/Atom}content',
+    '{http://purl.org/atom/ns#}content',
+)
+# Media RSS reuses names like content/title/description for attachments
+MEDIA_NS = '{http://search.yahoo.com/mrss/}'
+
+
+def open_url(url: str, timeout: float = 30) -> IO[bytes]:
+    """Open a URL as a binary stream, transparently un-gzipping sitemaps"""
+
+    request = urllib.request.Request(url, headers={'User-Agent': DEFAULT_USER_AGENT})
+    response = urllib.request.urlopen(request, timeout=timeout)
+    if url.endswith('.gz') or response.headers.get('Content-Encoding') == 'gzip':
+        return gzip.GzipFile(fileobj=response)
+    return response
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[float]:
+    """Parse RFC 822 (RSS) or ISO 8601 (Atom, sitemap) dates to epoch seconds"""
+
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def discover_feeds(page_html: str, base_url: str) -> List[str]:
+    """Find RSS/Atom feeds advertised with <link rel="alternate">"""
+
+    feeds = []
+    for tag in FEED_LINK_RE.findall(page_html):
+        attrs = {k.lower(): v for k, v in ATTR_RE.findall(tag)}
+        if 'alternate' in attrs.get('rel', '').lower() and \
+                attrs.get('type', '').lower() in FEED_TYPES and attrs.get('href'):
+            feeds.append(urljoin(base_url, html.unescape(attrs['href'])))
+    return feeds
+
+
+def discover_sitemaps(base_url: str) -> List[str]:
+    """Read Sitemap: lines from the site's robots.txt"""
+
+    parts = urlsplit(base_url)
+    robots_url = f"{parts.scheme}://{parts.netloc}/robots.txt"
+    try:
+        with open_url(robots_url) as response:
+            robots = response.read().decode('utf-8', errors='replace')
+    except Exception:
+        return []
+    return [
+        line.split(':', 1)[1].strip()
+        for line in robots.splitlines()
+        if line.lower().startswith('sitemap:')
+    ]
+
+
+def _local(tag: str) -> str:
+    """Strip the XML namespace from a tag name"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _entry(elem: ET.Element, kind: str) -> Dict[str, Any]:
+    """Convert an RSS item, Atom entry or sitemap <url>/<sitemap> to a dict"""
+
+    fields: Dict[str, Any] = {}
+
+    def first(key: str, value: Optional[str]) -> None:
+        """Keep the first non-empty value for a field"""
+        if value and value.strip() and not fields.get(key):
+            fields[key] = value
+
+    for child in elem:
+        if child.tag.startswith(MEDIA_NS):
+            continue
+        name = _local(child.tag)
+        if child.tag in CONTENT_TAGS:
+            first('content', child.text)
+        elif name == 'link':
+            # Atom puts the URL in href, RSS in the element text
+            href = child.get('href')
+            if href and child.get('rel', 'alternate') == 'alternate':
+                fields['link'] = href
+            elif child.text and child.text.strip():
+                fields.setdefault('link', child.text.strip())
+        elif name in ('loc', 'title', 'guid', 'id'):
+            first(name, (child.text or '').strip())
+        elif name in ('lastmod', 'updated', 'pubDate', 'published', 'date'):
+            first('updated', child.text)
+        elif name in ('description', 'summary'):
+            first('description', child.text)
+
+    return {
+        "kind": kind,
+        "url": fields.get('loc') or fields.get('link') or fields.get('guid') or fields.get('id'),
+        "title": html.unescape(fields.get('title', '')),
+        "updated": parse_timestamp(fields.get('updated')),
+        "content": fields.get('content') or fields.get('description', '')
+    }
+
+
+def iter_entries(stream: IO[bytes]) -> Iterator[Dict[str, Any]]:
+    """Stream entries from an RSS, Atom, sitemap or sitemap index document
+
+    Uses iterparse and clears each element once handled, so memory stays
+    flat even for sitemap indexes with tens of thousands of entries.
+    Entries are dicts with kind ("page" or "sitemap"), url, title,
+    updated (epoch seconds or None) and content.
+    """
+
+    root = None
+    for event, elem in ET.iterparse(stream, events=('start', 'end')):
+        if event == 'start':
+            if root is None:
+                root = elem
+            continue
+
+        name = _local(elem.tag)
+        if name in ('item', 'entry', 'url'):
+            entry = _entry(elem, 'page')
+        elif name == 'sitemap':
+            entry = _entry(elem, 'sitemap')
+        else:
+            continue
+
+        if entry['url']:
+            yield entry
+        elem.clear()
+        root.clear()
+
+
+def feed_result(entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Build an extraction result from a feed entry with full content"""
+
+    paragraphs = re.split(r'</p>|<br\s*/?>|\n\s*\n', entry['content'], flags=re.IGNORECASE)
+    paragraphs = [html.unescape(TAG_RE.sub('', p)).strip() for p in paragraphs]
+    content = '\n\n'.join(p for p in paragraphs if p)
+    if len(content.split()) < MIN_FEED_WORDS:
+        return None
+
+    return {
+        "url": entry['url'],
+        "title": entry['title'] or "Untitled",
+        "content": content,
+        "status": "success",
+        "extraction_time": datetime.utcnow().isoformat() + "Z",
+        "extraction_mode": "feed",
+        "word_count": len(content.split())
+    }
+
+
+class FetchState:
+    """Last successful fetch time per URL, persisted between runs"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.fetched: Dict[str, float] = {}
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                self.fetched = json.load(f)
+
+    def is_stale(self, url: str, updated: Optional[float]) -> bool:
+        """True if the URL changed since we last fetched it (or is unknown)"""
+        last = self.fetched.get(url)
+        return last is None or (updated is not None and updated > last)
+
+    def mark(self, url: str, fetched_at: Optional[float] = None) -> None:
+        self.fetched[url] = fetched_at or time.time()
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.fetched, f)
+        os.replace(tmp_path, self.path)
+
+
+def _is_xml(head: bytes, content_type: str) -> bool:
+    """Feeds and sitemaps, by Content-Type or leading bytes (not XHTML)"""
+    if 'html' in content_type:
+        return False
+    return 'xml' in content_type or head.lstrip().startswith(XML_MARKERS)
+
+
+def _in_section(url: str, section: str) -> bool:
+    """Whether a URL lies under a section URL (same host, path prefix)"""
+    parts, base = urlsplit(url), urlsplit(section)
+    prefix = base.path.rstrip('/')
+    return (parts.hostname == base.hostname
+            and (parts.path == prefix or parts.path.startswith(prefix + '/')))
+
+
+def discover_urls(
+    url_config: Dict[str, Any],
+    state: FetchState,
+    limit: int = 500
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Expand one input URL through its feeds or sitemaps
+
+    The URL may be a feed, a sitemap (index) or an HTML page that
+    advertises feeds. For pages without feeds, robots.txt sitemaps are
+    used, restricted to pages under the input URL's path, and the page
+    itself is kept. Returns (url_configs to fetch, results built from
+    feed content). Entries not modified since the last fetch are
+    skipped. If nothing can be discovered, the URL itself is returned
+    for a normal fetch.
+    """
+
+    url = url_config['url']
+    base_config = {k: v for k, v in url_config.items() if k != 'url'}
+    to_fetch: List[Dict[str, Any]] = []
+    ready: List[Dict[str, Any]] = []
+    section: Optional[str] = None
+
+    def walk(stream: IO[bytes]) -> bool:
+        """Collect stale entries; returns False if cut short by the limit"""
+        sitemaps = []
+        for entry in iter_entries(stream):
+            if len(to_fetch) + len(ready) >= limit:
+                return False
+            if entry['kind'] == 'sitemap':
+                # Without lastmod there is no way to tell, so re-read it
+                if entry['updated'] is None or state.is_stale(entry['url'], entry['updated']):
+                    sitemaps.append(entry['url'])
+                continue
+            if entry['url'] == url:
+                continue  # kept as given by the caller
+            if section is not None and not _in_section(entry['url'], section):
+                continue
+            if not state.is_stale(entry['url'], entry['updated']):
+                continue
+            result = feed_result(entry)
+            if result is not None:
+                ready.append(result)
+            else:
+                to_fetch.append({**base_config, "url": entry['url']})
+
+        # Child sitemaps are opened after the index stream is consumed
+        for sitemap_url in sitemaps:
+            found = len(to_fetch) + len(ready)
+            with open_url(sitemap_url) as child:
+                if not walk(child):
+                    return False
+            # Only skip a child sitemap once none of its pages are left to
+            # fetch: pages that fail stay stale, so it is re-read next run.
+            # Section walks see only part of it, so never mark there.
+            if section is None and len(to_fetch) + len(ready) == found:
+                state.mark(sitemap_url)
+        return True
+
+    with open_url(url) as response:
+        head = response.peek(512) if hasattr(response, 'peek') else b''
+        content_type = getattr(response, 'headers', {}).get('Content-Type', '') or ''
+        if _is_xml(head, content_type):
+            walk(response)
+            return to_fetch, ready
+        page_html = response.read().decode('utf-8', errors='replace')
+
+    documents = discover_feeds(page_html, url)
+    if not documents:
+        documents = discover_sitemaps(url)
+        if not documents:
+            return [url_config], []
+        # robots.txt sitemaps cover the whole site
+        if urlsplit(url).path.strip('/'):
+            section = url
+        to_fetch.append(url_config)
+
+    for document_url in documents:
+        with open_url(document_url) as stream:
+            if not walk(stream):
+                break
+
+    return to_fetch, ready
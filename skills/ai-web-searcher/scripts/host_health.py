@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Host Health - Per-domain error/latency tracking and circuit breaking across runs
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, Optional, Any
+from urllib.parse import urlsplit
+
+try:
+    import fcntl
+except ImportError:  # Windows: saves are not serialized across processes
+    fcntl = None
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+def host_of(url: str) -> str:
+    """Host (with explicit port, if any) used as the health key"""
+    parts = urlsplit(url)
+    if not parts.hostname:
+        return url.lower()
+    return f"{parts.hostname}:{parts.port}" if parts.port else parts.hostname
+
+
+class HostHealth:
+    """Persisted per-host health registry with a circuit breaker
+
+    Error rate and latency are exponentially weighted moving averages.
+    A host's circuit opens after `failure_threshold` consecutive
+    failures, or once its error rate passes `error_rate_threshold` over
+    at least `min_requests` requests. While open, requests fail fast.
+    After `cooldown` seconds one half-open probe is let through: success
+    closes the circuit, failure re-opens it.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        failure_threshold: int = 5,
+        error_rate_threshold: float = 0.5,
+        min_requests: int = 10,
+        cooldown: float = 300,
+        slow_latency: float = 10.0,
+        alpha: float = 0.2
+    ):
+        self.path = path
+        self.failure_threshold = failure_threshold
+        self.error_rate_threshold = error_rate_threshold
+        self.min_requests = min_requests
+        self.cooldown = cooldown
+        self.slow_latency = slow_latency
+        self.alpha = alpha
+        self.hosts: Dict[str, Dict[str, Any]] = self.load()
+        # Hosts updated since the last save; only these overwrite the file
+        self._dirty = set()
+        self._lock = threading.Lock()
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save(self) -> None:
+        """Merge our updates into the file and write it atomically
+
+        Other processes (queue workers, extract.py runs started by
+        smart_search.py) save the same file, so it is re-read under an
+        exclusive lock and only hosts updated here replace its entries.
+        """
+
+        directory = os.path.dirname(self.path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        with self._lock, open(self.path + '.lock', 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+            hosts = self.load()
+            for host in self._dirty:
+                hosts[host] = self.hosts[host]
+            # Pick up other processes' updates for hosts we did not touch
+            self.hosts.update({h: e for h, e in hosts.items() if h not in self._dirty})
+            self._dirty.clear()
+
+            fd, tmp_path = tempfile.mkstemp(
+                dir=directory, prefix=os.path.basename(self.path) + '.', suffix='.tmp'
+            )
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(hosts, f, indent=2)
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+
+    def _entry(self, host: str) -> Dict[str, Any]:
+        return self.hosts.setdefault(host, {
+            "state": CLOSED,
+            "requests": 0,
+            "consecutive_failures": 0,
+            "error_rate": 0.0,
+            "latency": None,
+            "opened_at": None,
+        })
+
+    def allow(self, url: str) -> bool:
+        """Whether a request to this URL's host may go ahead"""
+
+        with self._lock:
+            entry = self._entry(host_of(url))
+            if entry['state'] == CLOSED:
+                return True
+            # A half-open probe that never reported back (e.g. the run was
+            # killed) is retried after another cooldown
+            if time.time() - entry['opened_at'] >= self.cooldown:
+                # Let exactly one probe through
+                entry['state'] = HALF_OPEN
+                entry['opened_at'] = time.time()
+                self._dirty.add(host_of(url))
+                return True
+            return False
+
+    def is_open(self, url: str) -> bool:
+        with self._lock:
+            return self._entry(host_of(url))['state'] != CLOSED
+
+    def _observe(self, host: str, failed: bool, latency: Optional[float]) -> Dict[str, Any]:
+        entry = self._entry(host)
+        self._dirty.add(host)
+        entry['requests'] += 1
+        entry['error_rate'] += self.alpha * (float(failed) - entry['error_rate'])
+        if latency is not None:
+            if entry['latency'] is None:
+                entry['latency'] = latency
+            else:
+                entry['latency'] += self.alpha * (latency - entry['latency'])
+        return entry
+
+    def record_success(self, url: str, latency: Optional[float] = None) -> None:
+        with self._lock:
+            entry = self._observe(host_of(url), False, latency)
+            entry['consecutive_failures'] = 0
+            if entry['state'] != CLOSED:
+                entry['state'] = CLOSED
+                entry['opened_at'] = None
+
+    def record_failure(self, url: str, latency: Optional[float] = None) -> None:
+        with self._lock:
+            entry = self._observe(host_of(url), True, latency)
+            entry['consecutive_failures'] += 1
+
+            trip = (
+                entry['state'] == HALF_OPEN
+                or entry['consecutive_failures'] >= self.failure_threshold
+                or (entry['requests'] >= self.min_requests
+                    and entry['error_rate'] >= self.error_rate_threshold)
+            )
+            if trip and entry['state'] != OPEN:
+                entry['state'] = OPEN
+                entry['opened_at'] = time.time()
+
+    def score_factor(self, url: str) -> float:
+        """Ranking multiplier in (0, 1]: lower for failing or slow hosts"""
+
+        with self._lock:
+            entry = self.hosts.get(host_of(url))
+        if entry is None:
+            return 1.0
+
+        factor = 1.0 - 0.8 * entry['error_rate']
+        if entry['state'] != CLOSED:
+            factor *= 0.1
+        latency = entry.get('latency')
+        if latency and latency > self.slow_latency:
+            factor *= self.slow_latency / latency
+        return max(factor, 0.01)
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Result Store - Compact in-memory representation for large result sets
+"""
+
+import mmap
+import os
+import sys
+import tempfile
+import threading
+from typing import List, Dict, Optional, Any, Iterable, Iterator, Union
+
+# Fields stored as attributes; anything else goes into ExtractionRecord.extra
+RECORD_FIELDS = (
+    'url', 'title', 'status', 'extraction_mode', 'source_name', 'error',
+    'extraction_time', 'word_count', 'attempt', 'summary',
+)
+
+# Low-cardinality values repeated across thousands of records
+INTERNED_FIELDS = ('status', 'extraction_mode', 'source_name')
+
+
+class ContentSegment:
+    """Append-only file of UTF-8 content bodies, read back through mmap
+
+    Records keep only (offset, length) into the segment, so page bodies
+    live in the OS page cache instead of the Python heap.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix='ai-web-searcher-', suffix='.seg')
+            os.close(fd)
+            self._temporary = True
+        else:
+            self._temporary = False
+        self.path = path
+        self._file = open(path, 'a+b')
+        self._size = self._file.seek(0, os.SEEK_END)
+        self._map = None
+        self._mapped_size = 0
+        self._lock = threading.Lock()
+
+    def append(self, text: str) -> tuple:
+        """Write a body and return its (offset, length)"""
+        data = text.encode('utf-8')
+        with self._lock:
+            offset = self._size
+            self._file.write(data)
+            self._size += len(data)
+        return offset, len(data)
+
+    def view(self, offset: int, length: int) -> memoryview:
+        """Zero-copy view of a stored body"""
+        if length == 0:
+            return memoryview(b'')
+
+        with self._lock:
+            if offset + length > self._mapped_size:
+                self._file.flush()
+                # Earlier maps stay alive for as long as views reference them
+                self._map = mmap.mmap(self._file.fileno(), self._size, access=mmap.ACCESS_READ)
+                self._mapped_size = self._size
+            return memoryview(self._map)[offset:offset + length]
+
+    def close(self) -> None:
+        self._file.close()
+        self._map = None
+        if self._temporary and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class ExtractionRecord:
+    """Slotted result record whose content lives in a ContentSegment
+
+    Supports get() and [] like the plain result dicts, so writers and
+    printers accept either form.
+    """
+
+    __slots__ = RECORD_FIELDS + ('content_offset', 'content_length', 'extra', '_segment')
+
+    def __init__(self, result: Dict[str, Any], segment: ContentSegment):
+        result = dict(result)
+        for field in RECORD_FIELDS:
+            value = result.pop(field, None)
+            if field in INTERNED_FIELDS and isinstance(value, str):
+                value = sys.intern(value)
+            setattr(self, field, value)
+
+        content = result.pop('content', None)
+        if content is None:
+            self.content_offset, self.content_length = -1, 0
+        else:
+            self.content_offset, self.content_length = segment.append(content)
+
+        self.extra = result or None
+        self._segment = segment
+
+    def content_view(self) -> memoryview:
+        """UTF-8 bytes of the content without copying"""
+        return self._segment.view(max(self.content_offset, 0), self.content_length)
+
+    @property
+    def content(self) -> Optional[str]:
+        if self.content_offset < 0:
+            return None
+        return str(self.content_view(), 'utf-8')
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key == 'content':
+            content = self.content
+            return default if content is None else content
+        if key in RECORD_FIELDS:
+            value = getattr(self, key)
+            return default if value is None else value
+        return (self.extra or {}).get(key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Materialize the record as a plain result dict"""
+        result = {}
+        for field in RECORD_FIELDS:
+            value = getattr(self, field)
+            if value is not None:
+                result[field] = value
+        if self.content_offset >= 0:
+            result['content'] = self.content
+        if self.extra:
+            result.update(self.extra)
+        return result
+
+
+class ResultStore:
+    """List-like collection of ExtractionRecords sharing one ContentSegment"""
+
+    def __init__(self, segment_path: Optional[str] = None):
+        self.segment = ContentSegment(segment_path)
+        self.records: List[ExtractionRecord] = []
+
+    def append(self, result: Dict[str, Any]) -> ExtractionRecord:
+        record = ExtractionRecord(result, self.segment)
+        self.records.append(record)
+        return record
+
+    def extend(self, results: Iterable[Dict[str, Any]]) -> None:
+        for result in results:
+            self.append(result)
+
+    def __iter__(self) -> Iterator[ExtractionRecord]:
+        return iter(self.records)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __getitem__(self, index):
+        return self.records[index]
+
+    def close(self) -> None:
+        self.records = []
+        self.segment.close()
+
+
+def as_dict(result: Union[Dict[str, Any], ExtractionRecord]) -> Dict[str, Any]:
+    """Plain dict for a result dict or ExtractionRecord"""
+    if isinstance(result, ExtractionRecord):
+        return result.to_dict()
+    return result
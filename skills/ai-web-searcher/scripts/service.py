@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Search Service - Long-running server that keeps search and extraction state warm
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Any, Tuple
+
+from extract import DEFAULT_HOST_HEALTH, WebExtractor, extract_urls
+from host_health import HostHealth
+from service_client import SERVER_ENV
+from smart_search import SearchResults, SmartSearcher
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8766
+
+
+class ResultCache:
+    """Thread-safe TTL cache of successful extraction results"""
+
+    def __init__(self, ttl: float = 300):
+        self.ttl = ttl
+        self._entries: Dict[Tuple[str, str], Tuple[float, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get((url, key))
+            if entry is None:
+                return None
+            stored_at, result = entry
+            if time.time() - stored_at > self.ttl:
+                del self._entries[(url, key)]
+                return None
+            return dict(result)
+
+    def put(self, url: str, key: str, result: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[(url, key)] = (time.time(), dict(result))
+
+
+class CachedExtractor(WebExtractor):
+    """WebExtractor that serves repeated URLs from a shared cache"""
+
+    def __init__(self, cache: ResultCache, **options):
+        super().__init__(**options)
+        self.cache = cache
+
+    def cache_key(self, url_config: Optional[Dict]) -> str:
+        """Options that change a result, besides its URL"""
+        return json.dumps({
+            "mode": (url_config or {}).get('mode', self.mode),
+            "summarize": self.summarize,
+            "summary_length": self.summary_length,
+            "selectors": self.selectors,
+        }, sort_keys=True)
+
+    async def extract_single_url(
+        self,
+        url: str,
+        url_config: Optional[Dict] = None
+    ) -> Dict[str, Any]:
+        key = self.cache_key(url_config)
+        cached = self.cache.get(url, key)
+        if cached is not None:
+            return cached
+
+        result = await super().extract_single_url(url, url_config)
+        if result.get('status') == 'success':
+            self.cache.put(url, key, result)
+        return result
+
+
+class SearchService:
+    """Warm state shared by all requests: source registry and result cache"""
+
+    def __init__(self, sources_file: str, cache_ttl: float = 300):
+        self.cache = ResultCache(cache_ttl)
+        self.health = HostHealth(DEFAULT_HOST_HEALTH)
+        self.searcher = SmartSearcher(
+            sources_file,
+            extractor=CachedExtractor(
+                self.cache, mode="browser", retries=1, health=self.health
+            ),
+            health=self.health
+        )
+
+    def search(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        results = self.searcher.search_request(
+            payload.get('query'),
+            payload.get('category'),
+            payload.get('max_results', 10),
+            mode=payload.get('mode', 'browser'),
+            deadline=payload.get('deadline'),
+            hedge_percentile=payload.get('hedge_percentile', 75)
+        )
+        response = {"results": results}
+        if isinstance(results, SearchResults):
+            # Completeness marker for deadline-bounded searches
+            response.update(
+                total=results.total,
+                completed=results.completed,
+                cached=results.cached
+            )
+        return response
+
+    def extract(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        extractor = CachedExtractor(
+            self.cache,
+            mode=payload.get('mode', 'browser'),
+            concurrency=payload.get('concurrency', 3),
+            delay=payload.get('delay', '0'),
+            retries=payload.get('retries', 3),
+            summarize=payload.get('summarize', False),
+            summary_length=payload.get('summary_length', 200),
+            selectors=payload.get('selectors'),
+            health=self.health if payload.get('host_health', True) else None
+        )
+        results = asyncio.run(extract_urls(
+            urls=payload['urls'],
+            extractor=extractor,
+            continue_on_error=payload.get('continue_on_error', False)
+        ))
+        return {"results": results}
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    """JSON-over-HTTP endpoints: GET /health, POST /search, POST /extract"""
+
+    service: SearchService = None
+
+    def do_GET(self) -> None:
+        if self.path == '/health':
+            self.send_json(200, {"status": "ok"})
+        else:
+            self.send_json(404, {"error": f"Unknown endpoint: {self.path}"})
+
+    def do_POST(self) -> None:
+        routes = {
+            '/search': self.service.search,
+            '/extract': self.service.extract,
+        }
+        handler = routes.get(self.path)
+        if handler is None:
+            self.send_json(404, {"error": f"Unknown endpoint: {self.path}"})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            payload = json.loads(self.rfile.read(length) or b'{}')
+            body = handler(payload)
+        except (KeyError, ValueError) as e:
+            self.send_json(400, {"error": str(e)})
+            return
+        except Exception as e:
+            self.send_json(500, {"error": str(e)})
+            return
+
+        self.send_json(200, body)
+        try:
+            self.service.health.save()
+        except OSError as e:
+            print(f"⚠️  Could not save host health: {str(e)}")
+
+    def send_json(self, status: int, body: Dict[str, Any]) -> None:
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args) -> None:
+        print(f"🌐 {self.address_string()} {format % args}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Search Service - keep search and extraction warm between calls'
+    )
+
+    parser.add_argument('--host', default=DEFAULT_HOST,
+                       help=f'Address to listen on (default: {DEFAULT_HOST})')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT,
+                       help=f'Port to listen on (default: {DEFAULT_PORT})')
+    parser.add_argument('--sources', default='references/search_sources.json',
+                       help='Path to sources config file')
+    parser.add_argument('--cache-ttl', type=float, default=300,
+                       help='Seconds to reuse extracted pages (default: 300)')
+
+    args = parser.parse_args()
+
+    skill_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sources_file = args.sources
+    if not os.path.isabs(sources_file):
+        sources_file = os.path.join(skill_dir, sources_file)
+
+    try:
+        ServiceHandler.service = SearchService(sources_file, args.cache_ttl)
+        server = ThreadingHTTPServer((args.host, args.port), ServiceHandler)
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        sys.exit(1)
+
+    print(f"🚀 Service listening on http://{args.host}:{args.port}")
+    print(f"   Clients: --server http://{args.host}:{args.port} "
+          f"or export {SERVER_ENV}=http://{args.host}:{args.port}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Shutting down")
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
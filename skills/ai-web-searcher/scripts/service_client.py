@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Service Client - Thin client for service.py with one-shot fallback
+"""
+
+import http.client
+import json
+import os
+import urllib.error
+import urllib.request
+from typing import Dict, Optional, Any
+
+# Clients use this server when --server is not given
+SERVER_ENV = 'AI_WEB_SEARCHER_SERVER'
+
+
+def default_server() -> Optional[str]:
+    """Server URL from the environment, if any"""
+    return os.environ.get(SERVER_ENV) or None
+
+
+def call_service(
+    server: str,
+    endpoint: str,
+    payload: Dict[str, Any],
+    timeout: float = 600
+) -> Optional[Dict[str, Any]]:
+    """Send a request to a running service
+
+    Returns the response body (with a "results" list), or None if the
+    server is unreachable so the caller can fall back to one-shot mode.
+    """
+
+    request = urllib.request.Request(
+        server.rstrip('/') + endpoint,
+        data=json.dumps(payload).encode('utf-8'),
+        headers={'Content-Type': 'application/json'}
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.load(response)
+    except urllib.error.HTTPError as e:
+        try:
+            error = json.load(e)['error']
+        except (ValueError, KeyError, TypeError, OSError):
+            if e.code == 504:
+                # A proxy gave up waiting; the service may still be working
+                raise RuntimeError(f"Service timed out behind a gateway (HTTP {e.code})")
+            # Not our service (e.g. a proxy error page)
+            print(f"⚠️  Service unavailable at {server} (HTTP {e.code}), running one-shot")
+            return None
+        raise RuntimeError(f"Service error: {error}")
+    except urllib.error.URLError as e:
+        # Raised while connecting/sending, before the service got the request
+        print(f"⚠️  Service unavailable at {server} ({e.reason}), running one-shot")
+        return None
+    except (http.client.HTTPException, OSError) as e:
+        # The service has the request (read timeout, dropped connection);
+        # re-running it locally would repeat the work against the same hosts
+        raise RuntimeError(f"Service did not answer: {e or type(e).__name__}")
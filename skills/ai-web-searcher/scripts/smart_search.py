@@ -4,10 +4,16 @@ Smart Search - Search AI news from known sources first
 """
 
 import argparse
+import asyncio
 import json
 import os
+import signal
 import sys
 import subprocess
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
@@ -16,13 +22,67 @@ workspace = os.path.expanduser('~/.openclaw/workspace')
 if workspace not in sys.path:
     sys.path.insert(0, workspace)
 
+from extract import DEFAULT_HOST_HEALTH, WebExtractor
+from host_health import HostHealth
+from service_client import call_service, default_server
+from source_monitor import DEFAULT_FEED, SourceMonitor, read_feed
+
+
+class SearchResults(list):
+    """Result list with a completeness marker for deadline-bounded searches"""
+
+    def __init__(
+        self,
+        results: Optional[List[Dict[str, Any]]] = None,
+        total: int = 0,
+        completed: int = 0,
+        cached: int = 0
+    ):
+        super().__init__(results or [])
+        self.total = total          # sources searched
+        self.completed = completed  # sources that answered live
+        self.cached = cached        # sources answered from a cached copy
+
+    @property
+    def complete(self) -> bool:
+        return self.completed >= self.total
+
+    @classmethod
+    def from_response(cls, response: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Rebuild results from a service.py /search response"""
+        if 'total' not in response:
+            return response['results']
+        return cls(
+            response['results'],
+            total=response['total'],
+            completed=response['completed'],
+            cached=response['cached']
+        )
+
 
 class SmartSearcher:
     """Smart search that prioritizes known sources"""
 
-    def __init__(self, sources_file: str):
+    # Fetch latencies (seconds) kept across searches to pick the hedge point
+    LATENCY_HISTORY = 200
+    # Fetch threads shared by all deadline-bounded searches
+    FETCH_WORKERS = 16
+
+    def __init__(
+        self,
+        sources_file: str,
+        extractor: Optional[WebExtractor] = None,
+        health: Optional[HostHealth] = None
+    ):
         self.sources_file = sources_file
         self.sources = self.load_sources()
+        # In-process extractor (used by service.py); None runs extract.py
+        self.extractor = extractor
+        # Host health shared with extract.py, used to demote failing/slow hosts
+        self.health = health
+        self.latencies = deque(maxlen=self.LATENCY_HISTORY)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
 
     def load_sources(self) -> Dict[str, Any]:
         """Load search sources configuration"""
@@ -38,23 +98,24 @@ class SmartSearcher:
         query: str,
         max_results: int = 10,
         category: Optional[str] = None,
-        mode: str = "browser"
+        mode: str = "browser",
+        deadline: Optional[float] = None,
+        hedge_percentile: float = 75
     ) -> List[Dict[str, Any]]:
-        """Search from known sources"""
+        """Search from known sources
+
+        With a deadline (seconds), sources are searched concurrently and
+        whatever has arrived when the budget expires is returned as a
+        SearchResults carrying a completeness marker.
+        """
 
-        query_lower = query.lower()
         results = []
+        sources = self.select_sources(query, category)
 
-        # If category specified, use category-specific sources
-        if category and category in self.sources['search_categories']:
-            category_config = self.sources['search_categories'][category]
-            sources = self.filter_sources_by_keywords(
-                category_config['keywords'],
-                category_config.get('sources', [])
+        if deadline is not None:
+            return self.search_with_deadline(
+                sources[:max_results], query, mode, deadline, hedge_percentile
             )
-        else:
-            # Search all sources, prioritize by keyword matches
-            sources = self.score_sources(query_lower)
 
         # Extract content from top sources
         for source in sources[:max_results]:
@@ -64,6 +125,252 @@ class SmartSearcher:
 
         return results
 
+    def search_request(
+        self,
+        query: Optional[str] = None,
+        category: Optional[str] = None,
+        max_results: int = 10,
+        mode: str = "browser",
+        deadline: Optional[float] = None,
+        hedge_percentile: float = 75
+    ) -> List[Dict[str, Any]]:
+        """Answer a query and/or category, as both the CLI and service.py do
+
+        A category alone searches all of its keywords; a query (with an
+        optional category narrowing its sources) searches for the query.
+        """
+
+        if not query and not category:
+            raise ValueError("A query or category is required")
+        if category and not query:
+            return self.search_by_category(
+                category, mode, deadline=deadline, hedge_percentile=hedge_percentile
+            )
+        return self.search(
+            query,
+            max_results,
+            category=category,
+            mode=mode,
+            deadline=deadline,
+            hedge_percentile=hedge_percentile
+        )
+
+    def select_sources(
+        self,
+        query: str,
+        category: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Sources to search for a query, best first"""
+
+        # If category specified, use category-specific sources
+        if category and category in self.sources['search_categories']:
+            category_config = self.sources['search_categories'][category]
+            return self.filter_sources_by_keywords(
+                category_config['keywords'],
+                category_config.get('sources', [])
+            )
+
+        # Search all sources, prioritize by keyword matches
+        return self.score_sources(query.lower())
+
+    def fetch_executor(self) -> ThreadPoolExecutor:
+        """Bounded pool for deadline-bounded fetches, shared across searches
+
+        Threads cannot be killed, so in-process fetches that outlive a
+        deadline finish on their own (see WebExtractor's `deadline`);
+        bounding the pool keeps them from piling up across requests.
+        """
+
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.FETCH_WORKERS)
+            return self._executor
+
+    def search_with_deadline(
+        self,
+        sources: List[Dict[str, Any]],
+        query: str,
+        mode: str,
+        deadline: float,
+        hedge_percentile: float = 75
+    ) -> SearchResults:
+        """Search sources concurrently within a latency budget
+
+        A source still running past the hedge point (the given percentile
+        of recent fetch latencies, at most half the budget) gets a
+        duplicate request; whichever copy finishes first wins. When the
+        budget expires, extract.py processes are killed, queued fetches
+        are cancelled, in-process fetches stop at the deadline, and
+        sources fall back to the cached copy from their last run, if any.
+        """
+
+        start = time.monotonic()
+        end = start + deadline
+        wall_deadline = time.time() + deadline
+        processes: Dict[str, List[subprocess.Popen]] = {}
+        lock = threading.Lock()
+        closed = False
+
+        def kill_process(process: subprocess.Popen) -> None:
+            if process.poll() is None:
+                # extract.py runs curl; take down the whole group
+                try:
+                    os.killpg(process.pid, signal.SIGKILL)
+                except OSError:
+                    process.kill()
+
+        def register(name: str, process: subprocess.Popen) -> None:
+            with lock:
+                if not closed:
+                    processes.setdefault(name, []).append(process)
+                    return
+            # Started after the search finished (e.g. a late hedge)
+            kill_process(process)
+
+        def kill(name: str) -> None:
+            with lock:
+                for process in processes.get(name, []):
+                    kill_process(process)
+
+        # Read cached copies before live fetches overwrite them
+        cached = {}
+        for source in sources:
+            copy = self.load_cached_result(source, query)
+            if copy is not None:
+                cached[source['name']] = copy
+
+        results: Dict[str, Dict[str, Any]] = {}
+        hedged = set()
+        executor = self.fetch_executor()
+        attempts = {
+            executor.submit(
+                self.fetch_attempt, source, query, mode, '', register, wall_deadline
+            ): source
+            for source in sources
+        }
+        pending = set(attempts)
+
+        try:
+            while pending and len(results) < len(sources):
+                now = time.monotonic()
+                if now >= end:
+                    break
+
+                done, pending = wait(
+                    pending,
+                    timeout=min(end - now, 0.1),
+                    return_when=FIRST_COMPLETED
+                )
+                for future in done:
+                    source = attempts[future]
+                    result = future.result()
+                    if result is not None and source['name'] not in results:
+                        results[source['name']] = result
+                        self.latencies.append(time.monotonic() - start)
+                        # Cancel the other copy of a hedged fetch
+                        kill(source['name'])
+
+                elapsed = time.monotonic() - start
+                if elapsed >= self.hedge_after(deadline, hedge_percentile):
+                    for source in sources:
+                        name = source['name']
+                        if name in results or name in hedged:
+                            continue
+                        hedged.add(name)
+                        print(f"⏱️  Hedging slow source {name}")
+                        future = executor.submit(
+                            self.fetch_attempt, source, query, mode, '.hedge',
+                            register, wall_deadline
+                        )
+                        attempts[future] = source
+                        pending.add(future)
+        finally:
+            with lock:
+                closed = True
+            for name in list(processes):
+                kill(name)
+            for future in pending:
+                future.cancel()
+
+        completed = len(results)
+        from_cache = 0
+        for source in sources:
+            if source['name'] not in results and source['name'] in cached:
+                results[source['name']] = cached[source['name']]
+                from_cache += 1
+
+        if completed < len(sources):
+            print(f"⏱️  Deadline {deadline}s: {completed}/{len(sources)} sources live, "
+                  f"{from_cache} from cache")
+
+        ranked = sorted(
+            results.values(),
+            key=lambda x: (-x.get('relevance_score', 0), x.get('source_priority', 10))
+        )
+        return SearchResults(ranked, total=len(sources), completed=completed, cached=from_cache)
+
+    def hedge_after(self, deadline: float, percentile: float) -> float:
+        """Seconds after which a still-running fetch is duplicated"""
+
+        budget_cap = deadline / 2
+        if len(self.latencies) < 3:
+            return budget_cap
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * percentile / 100))
+        return min(ordered[index], budget_cap)
+
+    def load_cached_result(
+        self,
+        source: Dict[str, Any],
+        query: str
+    ) -> Optional[Dict[str, Any]]:
+        """Result left by the last extract.py run for a source, if any"""
+
+        path = self.result_path(source['name'])
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if not data or data[0].get('status') != 'success':
+            return None
+        result = self.annotate_result(data[0], source, query)
+        result['cached'] = True
+        return result
+
+    def fetch_attempt(
+        self,
+        source: Dict[str, Any],
+        query: str,
+        mode: str,
+        suffix: str = '',
+        register: Any = None,
+        deadline: Optional[float] = None
+    ) -> Optional[Dict[str, Any]]:
+        """One (possibly hedged) fetch of a source; None on failure
+
+        `deadline` (Unix timestamp) bounds in-process fetches, which
+        cannot be killed like extract.py processes.
+        """
+
+        try:
+            if self.extractor is not None:
+                data = [asyncio.run(self.extractor.extract_single_url(
+                    source['url'], {'mode': mode, 'deadline': deadline}
+                ))]
+            else:
+                data = self.run_extract_script(
+                    source['url'], source['name'], mode, suffix,
+                    register=lambda process: register(source['name'], process)
+                )
+        except Exception:
+            return None
+
+        if data and data[0].get('status') == 'success':
+            return self.annotate_result(data[0], source, query)
+        return None
+
     def filter_sources_by_keywords(
         self,
         keywords: List[str],
@@ -102,6 +409,10 @@ class SmartSearcher:
             # Apply priority factor
             score = score * (11 - source['priority'])  # Higher priority = higher score
 
+            # Demote hosts that are failing or chronically slow
+            if self.health is not None:
+                score = score * self.health.score_factor(source['url'])
+
             if score > 0:
                 scored.append({
                     'source': source,
@@ -126,41 +437,86 @@ class SmartSearcher:
 
         print(f"🔍 Searching {name}...")
 
-        # Use the main extract.py script
         try:
-            result = subprocess.run(
-                [
-                    'python3',
-                    os.path.join(os.path.dirname(__file__), 'extract.py'),
-                    '--url', url,
-                    '--mode', mode,
-                    '--format', 'json',
-                    '--output', f'/tmp/{name.replace(" ", "_")}_result.json'
-                ],
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
+            if self.extractor is not None:
+                data = [asyncio.run(
+                    self.extractor.extract_single_url(url, {'mode': mode})
+                )]
+            else:
+                data = self.run_extract_script(url, name, mode)
 
-            if result.returncode == 0:
-                with open(f'/tmp/{name.replace(" ", "_")}_result.json', 'r') as f:
-                    data = json.load(f)
-
-                if data and len(data) > 0 and data[0].get('status') == 'success':
-                    extracted = data[0]
-                    extracted['source_name'] = name
-                    extracted['source_priority'] = source['priority']
-                    extracted['relevance_score'] = self.calculate_relevance(
-                        extracted.get('content', ''),
-                        query
-                    )
-                    return extracted
+            if data and len(data) > 0 and data[0].get('status') == 'success':
+                return self.annotate_result(data[0], source, query)
 
         except Exception as e:
             print(f"❌ Failed to extract from {name}: {str(e)}")
 
         return None
 
+    def annotate_result(
+        self,
+        extracted: Dict[str, Any],
+        source: Dict[str, Any],
+        query: str
+    ) -> Dict[str, Any]:
+        """Add source and relevance fields to an extraction result"""
+
+        extracted['source_name'] = source['name']
+        extracted['source_priority'] = source['priority']
+        extracted['relevance_score'] = self.calculate_relevance(
+            extracted.get('content', ''),
+            query
+        )
+        return extracted
+
+    def result_path(self, name: str, suffix: str = '') -> str:
+        """Where extract.py writes the result for a source"""
+        return f'/tmp/{name.replace(" ", "_")}_result{suffix}.json'
+
+    def run_extract_script(
+        self,
+        url: str,
+        name: str,
+        mode: str,
+        suffix: str = '',
+        register: Any = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Run extract.py for one URL and load its JSON output
+
+        `register` receives the Popen handle so callers can kill it.
+        """
+
+        output_path = self.result_path(name, suffix)
+        process = subprocess.Popen(
+            [
+                'python3',
+                os.path.join(os.path.dirname(__file__), 'extract.py'),
+                '--url', url,
+                '--mode', mode,
+                '--format', 'json',
+                '--output', output_path
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            start_new_session=True
+        )
+        if register is not None:
+            register(process)
+
+        try:
+            process.communicate(timeout=60)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            raise
+
+        if process.returncode != 0:
+            return None
+
+        with open(output_path, 'r') as f:
+            return json.load(f)
+
     def calculate_relevance(self, content: str, query: str) -> float:
         """Calculate relevance score between content and query"""
 
@@ -179,45 +535,96 @@ class SmartSearcher:
 
         return matches / len(query.split())
 
+    def search_feed(
+        self,
+        query: str,
+        feed_path: str = DEFAULT_FEED,
+        max_results: int = 10,
+        since: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Search items already collected by the source monitor"""
+
+        matches = {}
+        for event in read_feed(feed_path, since):
+            # Events are in time order: an edited item drops the version it replaces
+            if event.get('replaces'):
+                matches.pop(event['replaces'], None)
+
+            relevance = self.calculate_relevance(event.get('content', ''), query)
+            if relevance <= 0:
+                continue
+
+            # Identical content re-emitted later collapses into one match
+            matches[event['fingerprint']] = {
+                'url': event.get('url', ''),
+                'title': event.get('title', 'Untitled'),
+                'content': event.get('content', ''),
+                'source_name': event.get('source_name', 'Unknown'),
+                'source_priority': event.get('source_priority', 10),
+                'relevance_score': relevance,
+                'extraction_time': event.get('event_time', 'N/A'),
+                'word_count': len(event.get('content', '').split())
+            }
+
+        results = sorted(
+            matches.values(),
+            key=lambda x: (-x['relevance_score'], x['source_priority'])
+        )
+        return results[:max_results]
+
     def search_by_category(
         self,
         category: str,
-        mode: str = "browser"
+        mode: str = "browser",
+        deadline: Optional[float] = None,
+        hedge_percentile: float = 75
     ) -> List[Dict[str, Any]]:
-        """Search all sources for a specific category"""
+        """Search all sources for a specific category
+
+        A deadline is shared by all keyword searches; keywords reached
+        after it expires count as incomplete.
+        """
 
         if category not in self.sources['search_categories']:
             raise ValueError(f"Unknown category: {category}")
 
         category_config = self.sources['search_categories'][category]
+        end = None if deadline is None else time.monotonic() + deadline
+        total = completed = from_cache = 0
 
-        results = []
+        # Deduplicate by URL while collecting, then sort by relevance
+        unique_results = {}
         for keyword in category_config['keywords'][:5]:  # Limit keywords
+            remaining = None if end is None else end - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                total += len(self.select_sources(keyword, category)[:3])
+                continue
+
             print(f"\n📂 Searching for: {keyword}")
 
             category_results = self.search(
                 query=keyword,
                 max_results=3,
                 category=category,
-                mode=mode
+                mode=mode,
+                deadline=remaining,
+                hedge_percentile=hedge_percentile
             )
-            results.extend(category_results)
-
-        # Deduplicate and sort by relevance
-        seen = set()
-        unique_results = []
-        for result in results:
-            key = result.get('url', '')
-            if key not in seen:
-                seen.add(key)
-                unique_results.append(result)
-
-        unique_results.sort(
+            if isinstance(category_results, SearchResults):
+                total += category_results.total
+                completed += category_results.completed
+                from_cache += category_results.cached
+            for result in category_results:
+                unique_results.setdefault(result.get('url', ''), result)
+
+        ranked = sorted(
+            unique_results.values(),
             key=lambda x: x.get('relevance_score', 0),
             reverse=True
         )
-
-        return unique_results
+        if deadline is None:
+            return ranked
+        return SearchResults(ranked, total=total, completed=completed, cached=from_cache)
 
     def list_sources(self) -> None:
         """List all configured sources"""
@@ -252,15 +659,32 @@ def main():
     parser.add_argument('--max-results', type=int, default=10,
                        help='Maximum results (default: 10)')
     parser.add_argument('--mode', choices=['light', 'browser', 'deep'],
-                       default='browser', help='Extraction mode')
+                       help='Extraction mode (default: browser, light with --watch)')
     parser.add_argument('--list-sources', action='store_true',
                        help='List all configured sources')
     parser.add_argument('--list-categories', action='store_true',
                        help='List all search categories')
     parser.add_argument('--sources', default='references/search_sources.json',
                        help='Path to sources config file')
+    parser.add_argument('--server', default=default_server(),
+                       help='Search service URL (see service.py); falls back to one-shot')
+    parser.add_argument('--deadline', type=float,
+                       help='Latency budget in seconds; returns partial results when it expires')
+    parser.add_argument('--hedge-percentile', type=float, default=75,
+                       help='Duplicate fetches slower than this latency percentile (default: 75)')
+    parser.add_argument('--watch', action='store_true',
+                       help='Refresh sources on their update_frequency, appending changes to --feed')
+    parser.add_argument('--once', action='store_true',
+                       help='With --watch, refresh due sources once and exit (for cron)')
+    parser.add_argument('--from-feed', action='store_true',
+                       help='Answer the query from --feed instead of scraping sources')
+    parser.add_argument('--feed', default=DEFAULT_FEED,
+                       help=f'Change feed file (default: {DEFAULT_FEED})')
+    parser.add_argument('--since', help='With --from-feed, only items after this ISO timestamp')
 
     args = parser.parse_args()
+    if args.mode is None:
+        args.mode = 'light' if args.watch else 'browser'
 
     # Change to skill directory
     skill_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -271,20 +695,48 @@ def main():
         sources_file = os.path.join(skill_dir, sources_file)
 
     try:
-        searcher = SmartSearcher(sources_file)
-
-        if args.list_sources:
+        if args.from_feed and args.query:
+            searcher = SmartSearcher(sources_file)
+            results = searcher.search_feed(
+                args.query, args.feed, args.max_results, args.since
+            )
+            print_results(results, args.max_results)
+            return
+
+        if args.server and (args.query or args.category):
+            response = call_service(args.server, '/search', {
+                'query': args.query,
+                'category': args.category,
+                'max_results': args.max_results,
+                'mode': args.mode,
+                'deadline': args.deadline,
+                'hedge_percentile': args.hedge_percentile
+            })
+            if response is not None:
+                print_results(SearchResults.from_response(response), args.max_results)
+                return
+
+        searcher = SmartSearcher(sources_file, health=HostHealth(DEFAULT_HOST_HEALTH))
+
+        if args.watch:
+            monitor = SourceMonitor(searcher, feed_path=args.feed, mode=args.mode)
+            if args.once:
+                emitted = monitor.poll_once()
+                print(f"\n✨ Emitted {emitted} new/changed items to {args.feed}")
+            else:
+                monitor.run()
+        elif args.list_sources:
             searcher.list_sources()
         elif args.list_categories:
             searcher.list_categories()
-        elif args.category:
-            results = searcher.search_by_category(args.category, args.mode)
-            print_results(results, args.max_results)
-        elif args.query:
-            results = searcher.search(
+        elif args.query or args.category:
+            results = searcher.search_request(
                 args.query,
+                args.category,
                 args.max_results,
-                mode=args.mode
+                mode=args.mode,
+                deadline=args.deadline,
+                hedge_percentile=args.hedge_percentile
             )
             print_results(results, args.max_results)
         else:
@@ -300,6 +752,9 @@ def print_results(results: List[Dict[str, Any]], max_results: int) -> None:
 
     print(f"\n{'='*60}")
     print(f"📰 Found {len(results)} results")
+    if isinstance(results, SearchResults) and not results.complete:
+        print(f"⚠️  Partial: {results.completed}/{results.total} sources answered "
+              f"before the deadline ({results.cached} from cache)")
     print(f"{'='*60}\n")
 
     results = results[:max_results]
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Source Monitor - Poll sources on their update_frequency and emit only changed items
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import List, Dict, Optional, Any, Iterator
+
+from extract import STATE_DIR
+
+DEFAULT_FEED = os.path.join(STATE_DIR, 'feed.jsonl')
+DEFAULT_MONITOR_STATE = os.path.join(STATE_DIR, 'monitor_state.json')
+
+# Seconds between refreshes for each update_frequency value
+FREQUENCY_SECONDS = {
+    'hourly': 3600,
+    'daily': 86400,
+    'weekly': 7 * 86400,
+    'monthly': 30 * 86400,
+}
+DEFAULT_FREQUENCY = 'daily'
+
+# Longest wait before retrying a source whose fetch failed
+RETRY_SECONDS = 15 * 60
+
+
+def fingerprint(text: str) -> str:
+    """Content fingerprint, insensitive to whitespace and case"""
+    normalized = ' '.join(text.split()).lower()
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+
+
+def read_feed(
+    feed_path: str = DEFAULT_FEED,
+    since: Optional[str] = None
+) -> Iterator[Dict[str, Any]]:
+    """Yield feed events, optionally only those after an ISO timestamp"""
+
+    if not os.path.exists(feed_path):
+        return
+
+    with open(feed_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            event = json.loads(line)
+            if since and event.get('event_time', '') <= since:
+                continue
+            yield event
+
+
+class SourceMonitor:
+    """Refresh each source on its own schedule and append changes to a feed
+
+    A source page is split into paragraph items, each identified by a
+    content fingerprint. Only items not present in the previous version
+    of the page are written to the append-only feed, so downstream
+    queries read a small stream of changes instead of re-scraping.
+    """
+
+    def __init__(
+        self,
+        searcher: Any,
+        feed_path: str = DEFAULT_FEED,
+        state_path: str = DEFAULT_MONITOR_STATE,
+        mode: str = "light",
+        concurrency: int = 3
+    ):
+        self.searcher = searcher
+        self.feed_path = feed_path
+        self.state_path = state_path
+        self.mode = mode
+        self.concurrency = concurrency
+        self.state = self.load_state()
+        self._lock = threading.Lock()
+
+    def load_state(self) -> Dict[str, Any]:
+        """Load per-source fingerprints and last check times"""
+
+        if not os.path.exists(self.state_path):
+            return {}
+
+        with open(self.state_path, 'r') as f:
+            return json.load(f)
+
+    def save_state(self) -> None:
+        """Write state atomically so an interrupted run keeps the old copy"""
+
+        os.makedirs(os.path.dirname(self.state_path) or '.', exist_ok=True)
+        tmp_path = self.state_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def interval(self, source: Dict[str, Any]) -> float:
+        """Refresh interval in seconds for a source"""
+        frequency = source.get('update_frequency', DEFAULT_FREQUENCY)
+        return FREQUENCY_SECONDS.get(frequency, FREQUENCY_SECONDS[DEFAULT_FREQUENCY])
+
+    def next_due(self, source: Dict[str, Any]) -> float:
+        """Timestamp at which a source should next be refreshed"""
+        entry = self.state.get(source['name'], {})
+        if 'retry_at' in entry:
+            return entry['retry_at']
+        return entry.get('last_checked', 0) + self.interval(source)
+
+    def due_sources(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Sources whose refresh interval has elapsed"""
+        now = now or time.time()
+        return [
+            source for source in self.searcher.sources['ai_news_sources']
+            if self.next_due(source) <= now
+        ]
+
+    def poll_source(self, source: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Fetch one source and return events for new or changed items"""
+
+        name = source['name']
+        previous = self.state.get(name)
+        result = self.searcher.extract_from_source(source, '', self.mode)
+
+        if result is None:
+            # Keep the old fingerprints and last_checked; retry soon rather
+            # than a whole interval later
+            retry_after = min(self.interval(source), RETRY_SECONDS)
+            with self._lock:
+                self.state.setdefault(name, {})['retry_at'] = time.time() + retry_after
+            return []
+
+        content = result.get('content', '')
+        page_fingerprint = fingerprint(content)
+        events = []
+
+        if previous is None or previous.get('fingerprint') != page_fingerprint:
+            previous_items = (previous or {}).get('items', [])
+            known = set(previous_items)
+            items = [p for p in content.split('\n\n') if p.strip()]
+            event_time = datetime.utcnow().isoformat() + "Z"
+            item_fingerprints = [fingerprint(item) for item in items]
+            current = set(item_fingerprints)
+
+            for index, (item, item_fingerprint) in enumerate(zip(items, item_fingerprints)):
+                if item_fingerprint in known:
+                    continue
+                event = {
+                    "event_time": event_time,
+                    "change": "new" if previous is None else "changed",
+                    "source_name": name,
+                    "source_priority": source['priority'],
+                    "url": result.get('url', source['url']),
+                    "title": result.get('title', 'Untitled'),
+                    "fingerprint": item_fingerprint,
+                    "content": item
+                }
+                # An edited paragraph: the item that held this position is gone
+                if index < len(previous_items) and previous_items[index] not in current:
+                    event["replaces"] = previous_items[index]
+                events.append(event)
+        else:
+            item_fingerprints = previous.get('items', [])
+
+        with self._lock:
+            self.state[name] = {
+                "last_checked": time.time(),
+                "fingerprint": page_fingerprint,
+                "items": item_fingerprints
+            }
+
+        return events
+
+    def append_events(self, events: List[Dict[str, Any]]) -> None:
+        """Append events to the feed, one JSON object per line"""
+
+        if not events:
+            return
+
+        os.makedirs(os.path.dirname(self.feed_path) or '.', exist_ok=True)
+        with self._lock:
+            with open(self.feed_path, 'a', encoding='utf-8') as f:
+                for event in events:
+                    f.write(json.dumps(event, ensure_ascii=False) + '\n')
+
+    def poll_once(self, now: Optional[float] = None) -> int:
+        """Refresh all due sources; returns the number of events emitted"""
+
+        due = self.due_sources(now)
+        if not due:
+            return 0
+
+        emitted = 0
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for source, events in zip(due, executor.map(self.poll_source, due)):
+                self.append_events(events)
+                emitted += len(events)
+                print(f"👀 {source['name']}: {len(events)} new/changed items")
+
+        self.save_state()
+        return emitted
+
+    def run(self, max_sleep: float = 3600) -> None:
+        """Poll forever, sleeping until the next source is due"""
+
+        print(f"👀 Watching {len(self.searcher.sources['ai_news_sources'])} sources")
+        print(f"   Feed: {self.feed_path}\n")
+
+        while True:
+            self.poll_once()
+            next_due = min(
+                (self.next_due(source)
+                 for source in self.searcher.sources['ai_news_sources']),
+                default=time.time() + max_sleep
+            )
+            sleep_time = min(max(next_due - time.time(), 1), max_sleep)
+            time.sleep(sleep_time)
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Work Queue - SQLite-backed URL queue for distributed extraction
+"""
+
+import json
+import sqlite3
+import time
+from typing import List, Dict, Optional, Any, Iterator, Tuple
+from urllib.parse import urlsplit
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS urls (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT UNIQUE NOT NULL,
+    domain TEXT NOT NULL,
+    config TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    result TEXT
+);
+CREATE INDEX IF NOT EXISTS urls_domain_state ON urls (domain, state);
+CREATE TABLE IF NOT EXISTS leases (
+    domain TEXT PRIMARY KEY,
+    worker TEXT NOT NULL,
+    expires REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS domains (
+    domain TEXT PRIMARY KEY,
+    last_fetch REAL NOT NULL
+);
+"""
+
+
+def url_domain(url: str) -> str:
+    """Get the shard key (host name) for a URL"""
+    return (urlsplit(url).hostname or '').lower()
+
+
+class WorkQueue:
+    """Shared work queue with per-domain leases
+
+    URLs are sharded by domain and a worker leases a whole domain at a
+    time, so per-host delays still hold when several workers (or
+    machines sharing the database file) process the same queue. A lease
+    that is not renewed before it expires is handed to the next worker.
+
+    The default rollback journal is used rather than WAL: WAL needs
+    shared memory on a single host and breaks on network filesystems.
+    Sharing across machines still depends on the filesystem honouring
+    POSIX locks (see references/CONCURRENCY.md).
+    """
+
+    def __init__(self, path: str, timeout: float = 30.0):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        # Also switches queues created in WAL mode back (the mode is persistent)
+        self.conn.execute('PRAGMA journal_mode=DELETE')
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def enqueue(self, url_configs: List[Dict[str, Any]], requeue: bool = False) -> int:
+        """Add URLs to the queue, skipping ones already queued
+
+        With `requeue`, URLs already done are reset to pending (e.g.
+        pages that discovery found changed since they were fetched).
+        """
+
+        sql = 'INSERT OR IGNORE INTO urls (url, domain, config) VALUES (?, ?, ?)'
+        if requeue:
+            sql = (
+                'INSERT INTO urls (url, domain, config) VALUES (?, ?, ?) '
+                "ON CONFLICT (url) DO UPDATE SET state = 'pending', "
+                "config = excluded.config, result = NULL WHERE state = 'done'"
+            )
+
+        added = 0
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            for url_config in url_configs:
+                if isinstance(url_config, str):
+                    url_config = {"url": url_config}
+                url = url_config.get('url')
+                if not url:
+                    continue
+                cursor = self.conn.execute(
+                    sql, (url, url_domain(url), json.dumps(url_config))
+                )
+                added += cursor.rowcount
+            self.conn.execute('COMMIT')
+        except Exception:
+            self.conn.execute('ROLLBACK')
+            raise
+        return added
+
+    def add_results(self, results: List[Dict[str, Any]]) -> int:
+        """Store results that needed no fetch (e.g. full feed entries) as done
+
+        Replaces the stored result of a URL that is not currently leased.
+        """
+
+        added = 0
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            for result in results:
+                cursor = self.conn.execute(
+                    "INSERT INTO urls (url, domain, config, state, result) "
+                    "VALUES (?, ?, ?, 'done', ?) "
+                    "ON CONFLICT (url) DO UPDATE SET state = 'done', "
+                    "result = excluded.result WHERE state != 'leased'",
+                    (result['url'], url_domain(result['url']),
+                     json.dumps({"url": result['url']}),
+                     json.dumps(result, ensure_ascii=False))
+                )
+                added += cursor.rowcount
+            self.conn.execute('COMMIT')
+        except Exception:
+            self.conn.execute('ROLLBACK')
+            raise
+        return added
+
+    def _expire_leases(self, now: float) -> None:
+        """Return URLs held by expired leases to the pending state"""
+        expired = [row[0] for row in self.conn.execute(
+            'SELECT domain FROM leases WHERE expires < ?', (now,)
+        )]
+        for domain in expired:
+            self.conn.execute(
+                "UPDATE urls SET state = 'pending' WHERE domain = ? AND state = 'leased'",
+                (domain,)
+            )
+            self.conn.execute('DELETE FROM leases WHERE domain = ?', (domain,))
+
+    def lease(
+        self,
+        worker: str,
+        batch_size: int = 20,
+        lease_seconds: float = 300
+    ) -> Optional[Tuple[str, List[Tuple[int, Dict[str, Any]]]]]:
+        """Lease a batch of pending URLs from one unleased domain
+
+        Returns (domain, [(url_id, url_config), ...]) or None if every
+        domain with pending work is currently leased by someone else.
+        """
+
+        now = time.time()
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            self._expire_leases(now)
+            row = self.conn.execute(
+                "SELECT domain FROM urls WHERE state = 'pending' "
+                "AND domain NOT IN (SELECT domain FROM leases) "
+                "ORDER BY id LIMIT 1"
+            ).fetchone()
+            if row is None:
+                self.conn.execute('COMMIT')
+                return None
+
+            domain = row[0]
+            self.conn.execute(
+                'INSERT INTO leases (domain, worker, expires) VALUES (?, ?, ?)',
+                (domain, worker, now + lease_seconds)
+            )
+            rows = self.conn.execute(
+                "SELECT id, config FROM urls WHERE domain = ? AND state = 'pending' "
+                "ORDER BY id LIMIT ?",
+                (domain, batch_size)
+            ).fetchall()
+            self.conn.executemany(
+                "UPDATE urls SET state = 'leased' WHERE id = ?",
+                [(url_id,) for url_id, _ in rows]
+            )
+            self.conn.execute('COMMIT')
+        except Exception:
+            self.conn.execute('ROLLBACK')
+            raise
+
+        return domain, [(url_id, json.loads(config)) for url_id, config in rows]
+
+    def renew(self, domain: str, worker: str, lease_seconds: float = 300) -> bool:
+        """Extend a lease; returns False if the lease was lost"""
+        cursor = self.conn.execute(
+            'UPDATE leases SET expires = ? WHERE domain = ? AND worker = ?',
+            (time.time() + lease_seconds, domain, worker)
+        )
+        return cursor.rowcount > 0
+
+    def complete(self, url_id: int, result: Dict[str, Any]) -> None:
+        """Store the result for a URL, mark it done and note the fetch time"""
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            self.conn.execute(
+                "UPDATE urls SET state = 'done', result = ? WHERE id = ?",
+                (json.dumps(result, ensure_ascii=False), url_id)
+            )
+            self.conn.execute(
+                'INSERT OR REPLACE INTO domains (domain, last_fetch) '
+                'SELECT domain, ? FROM urls WHERE id = ?',
+                (time.time(), url_id)
+            )
+            self.conn.execute('COMMIT')
+        except Exception:
+            self.conn.execute('ROLLBACK')
+            raise
+
+    def last_fetch(self, domain: str) -> Optional[float]:
+        """When any worker last finished a URL on this domain, if ever"""
+        row = self.conn.execute(
+            'SELECT last_fetch FROM domains WHERE domain = ?', (domain,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def release(self, domain: str, worker: str) -> None:
+        """Give up a lease, returning unfinished URLs to the queue"""
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            cursor = self.conn.execute(
+                'DELETE FROM leases WHERE domain = ? AND worker = ?',
+                (domain, worker)
+            )
+            if cursor.rowcount:
+                self.conn.execute(
+                    "UPDATE urls SET state = 'pending' WHERE domain = ? AND state = 'leased'",
+                    (domain,)
+                )
+            self.conn.execute('COMMIT')
+        except Exception:
+            self.conn.execute('ROLLBACK')
+            raise
+
+    def counts(self) -> Dict[str, int]:
+        """Count URLs by state"""
+        counts = {'pending': 0, 'leased': 0, 'done': 0}
+        for state, count in self.conn.execute(
+            'SELECT state, COUNT(*) FROM urls GROUP BY state'
+        ):
+            counts[state] = count
+        return counts
+
+    def iter_results(self) -> Iterator[Dict[str, Any]]:
+        """Yield finished results in enqueue order"""
+        cursor = self.conn.execute(
+            "SELECT result FROM urls WHERE state = 'done' ORDER BY id"
+        )
+        for (result,) in cursor:
+            yield json.loads(result)